@@ -1,35 +1,40 @@
-from flask import Flask, request, jsonify, Response
+from flask import Flask, request, Response
+from werkzeug.exceptions import RequestEntityTooLarge
+from openai import OpenAI, DefaultHttpxClient
+import httpx
 import os
-import json
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import Future
+import orjson
+import threading
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
-app = Flask(__name__)
+MAX_BODY = 64 * 1024
+# Cap on concurrent OpenAI calls per process; requests past it wait for a slot
+# instead of piling onto the API and coming back as 429s
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+OPENAI_CHAT_MODEL = os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini")
+
+# static_folder=None keeps Flask's built-in /static route from shadowing
+# the in-memory static handler below
+app = Flask(__name__, static_folder=None)
+# Werkzeug rejects larger request bodies before reading them
+app.config["MAX_CONTENT_LENGTH"] = MAX_BODY
 
 # Project root
 project_root = Path(__file__).parent.parent
+_TEMPLATE_PATH = str(project_root / "web" / "templates" / "index_chatgpt.html")
+_STATIC_ROOT = project_root / "web" / "static"
 
 
-def get_openai_client():
-    """Get OpenAI client if API key is available."""
-    api_key = os.getenv("OPENAI_API_KEY", "").strip()
-    if not api_key:
-        return None, "OPENAI_API_KEY not set. Configure in Vercel Dashboard > Settings > Environment Variables"
-    
-    try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
-        return client, None
-    except Exception as e:
-        return None, f"OpenAI init error: {str(e)}"
-
-
-def chat_with_openai(client, message: str, use_council: bool = False) -> str:
-    """Chat using OpenAI directly."""
-    
-    if use_council:
-        system_prompt = """You are a Marketing Council for GrowthBoss, a Toronto marketing agency.
+# System prompts are module constants so every request sends a byte-identical
+# prefix, which lets OpenAI's prompt caching reuse it
+COUNCIL_SYSTEM_PROMPT = """You are a Marketing Council for GrowthBoss, a Toronto marketing agency.
 You channel the wisdom of marketing experts like Gary Vaynerchuk, Alex Hormozi, and Iman Gadzhi.
 
 GrowthBoss offers:
@@ -42,8 +47,8 @@ GrowthBoss offers:
 
 Use the KLT (Know, Like, Trust) Ecosystem framework in your recommendations.
 Provide actionable, practical advice combining insights from all three mentors."""
-    else:
-        system_prompt = """You are the GrowthBoss AI Companion, a helpful assistant for GrowthBoss marketing agency.
+
+COMPANION_SYSTEM_PROMPT = """You are the GrowthBoss AI Companion, a helpful assistant for GrowthBoss marketing agency.
 
 GrowthBoss is a Toronto-based marketing agency offering:
 - Website design and development
@@ -56,124 +61,394 @@ GrowthBoss is a Toronto-based marketing agency offering:
 We use the KLT (Know, Like, Trust) Ecosystem framework.
 Provide helpful, professional responses about marketing, business growth, and GrowthBoss services."""
 
+
+def _create_openai_client():
+    """Build the OpenAI client, or explain why it can't be built."""
+    api_key = os.getenv("OPENAI_API_KEY", "").strip()
+    if not api_key:
+        return None, "OPENAI_API_KEY not set. Configure in Vercel Dashboard > Settings > Environment Variables"
+    
+    try:
+        # One pooled client; keep-alive sockets are sized to the concurrency cap
+        http_client = DefaultHttpxClient(limits=httpx.Limits(
+            max_connections=OPENAI_MAX_CONCURRENCY,
+            max_keepalive_connections=OPENAI_MAX_CONCURRENCY,
+        ))
+        return OpenAI(api_key=api_key, http_client=http_client), None
+    except Exception as e:
+        return None, f"OpenAI init error: {str(e)}"
+
+
+# Built during the platform's init phase and reused across warm invocations
+_OPENAI_CLIENT, _OPENAI_ERROR = _create_openai_client()
+_OPENAI_SLOTS = threading.BoundedSemaphore(OPENAI_MAX_CONCURRENCY)
+
+
+def get_openai_client():
+    """Get OpenAI client if API key is available."""
+    global _OPENAI_CLIENT, _OPENAI_ERROR
+    if _OPENAI_CLIENT is None:
+        _OPENAI_CLIENT, _OPENAI_ERROR = _create_openai_client()
+    return _OPENAI_CLIENT, _OPENAI_ERROR
+
+
+# Built once; only the user message is allocated per request
+_COUNCIL_SYSTEM_MESSAGE = {"role": "system", "content": COUNCIL_SYSTEM_PROMPT}
+_COMPANION_SYSTEM_MESSAGE = {"role": "system", "content": COMPANION_SYSTEM_PROMPT}
+
+
+def _system_prompt(use_council: bool) -> str:
+    """System prompt for the council or the general companion."""
+    return COUNCIL_SYSTEM_PROMPT if use_council else COMPANION_SYSTEM_PROMPT
+
+
+def _create_completion(client, message: str, use_council: bool, stream: bool = False):
+    return client.chat.completions.create(
+        model=OPENAI_CHAT_MODEL,
+        messages=[
+            _COUNCIL_SYSTEM_MESSAGE if use_council else _COMPANION_SYSTEM_MESSAGE,
+            {"role": "user", "content": message}
+        ],
+        max_tokens=1000,
+        temperature=0.7,
+        stream=stream
+    )
+
+
+# Identical questions share one upstream call while it is in flight, and the
+# answer is replayed to repeats until it expires
+ANSWER_TTL_SECONDS = int(os.getenv("CHAT_CACHE_TTL", "3600"))
+_MAX_RECENT_ANSWERS = 2048
+_INFLIGHT: Dict[str, Future] = {}
+_RECENT_ANSWERS: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_ANSWERS_LOCK = threading.Lock()
+
+
+def _answer_key(message: str, use_council: bool) -> str:
+    # Case and surrounding whitespace don't change the question
+    normalized = message.strip().lower()
+    return hashlib.sha1(_system_prompt(use_council).encode("utf-8") + b"\0" + normalized.encode("utf-8")).hexdigest()
+
+
+def _recent_answer(key: str) -> Optional[str]:
+    """Cached answer for a key, if it hasn't expired. Caller holds _ANSWERS_LOCK."""
+    recent = _RECENT_ANSWERS.get(key)
+    if recent is None:
+        return None
+    if recent[0] <= time.monotonic():
+        del _RECENT_ANSWERS[key]
+        return None
+    _RECENT_ANSWERS.move_to_end(key)
+    return recent[1]
+
+
+def _remember_answer(key: str, answer: str):
+    """Store a completed answer. Caller holds _ANSWERS_LOCK."""
+    _RECENT_ANSWERS[key] = (time.monotonic() + ANSWER_TTL_SECONDS, answer)
+    _RECENT_ANSWERS.move_to_end(key)
+    if len(_RECENT_ANSWERS) > _MAX_RECENT_ANSWERS:
+        _RECENT_ANSWERS.popitem(last=False)
+
+
+def _complete_deduped(client, message: str, use_council: bool) -> str:
+    """Complete a message, coalescing identical concurrent and recent requests."""
+    key = _answer_key(message, use_council)
+    with _ANSWERS_LOCK:
+        recent = _recent_answer(key)
+        if recent is not None:
+            return recent
+        future = _INFLIGHT.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = _INFLIGHT[key] = Future()
+    
+    if not is_owner:
+        return future.result()
+    
     try:
-        response = client.chat.completions.create(
-            model=os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini"),
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": message}
-            ],
-            max_tokens=1000,
-            temperature=0.7
-        )
-        return response.choices[0].message.content
+        with _OPENAI_SLOTS:
+            response = _create_completion(client, message, use_council)
+        answer = response.choices[0].message.content
+        if not answer:
+            # Don't replay a blank completion to every repeat of the question
+            raise RuntimeError("OpenAI returned an empty answer")
+    except Exception as e:
+        with _ANSWERS_LOCK:
+            del _INFLIGHT[key]
+        future.set_exception(e)
+        raise
+    
+    with _ANSWERS_LOCK:
+        del _INFLIGHT[key]
+        _remember_answer(key, answer)
+    future.set_result(answer)
+    return answer
+
+
+def chat_with_openai(client, message: str, use_council: bool = False) -> str:
+    """Chat using OpenAI directly."""
+    try:
+        return _complete_deduped(client, message, use_council)
     except Exception as e:
         return f"Error: {str(e)}"
 
 
-@app.route("/")
-def index():
-    """Serve the main page."""
-    template_path = project_root / "web" / "templates" / "index_chatgpt.html"
+def stream_chat_with_openai(client, message: str, use_council: bool = False):
+    """Yield completion text as OpenAI generates it."""
+    key = _answer_key(message, use_council)
+    with _ANSWERS_LOCK:
+        recent = _recent_answer(key)
+    if recent is not None:
+        yield recent
+        return
     
-    if not template_path.exists():
-        return "<h1>GrowthBoss AI - Template not found</h1>", 404
+    parts = []
+    # The slot is held until the stream is drained, since the connection is busy until then
+    with _OPENAI_SLOTS:
+        for chunk in _create_completion(client, message, use_council, stream=True):
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                yield chunk.choices[0].delta.content
+    
+    if parts:
+        with _ANSWERS_LOCK:
+            _remember_answer(key, "".join(parts))
+
+
+def _etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+
+
+def _not_modified(etag: str) -> Optional[Response]:
+    """Return an empty 304 if the client already holds this ETag."""
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status=304, headers={"ETag": etag})
+    return None
+
+
+def _build_template() -> Tuple[Optional[bytes], Optional[str]]:
+    """Read the index template and rewrite url_for() calls to static paths."""
+    # Also runs per request while the template is missing, so avoid pathlib
+    if not os.path.isfile(_TEMPLATE_PATH):
+        return None, None
     
-    with open(template_path, "r", encoding="utf-8") as f:
+    with open(_TEMPLATE_PATH, "rb") as f:
         html = f.read()
     
     # Replace Flask url_for with static paths
     html = html.replace(
-        "{{ url_for('static', filename='css/chatgpt_style.css') }}",
-        "/static/css/chatgpt_style.css"
+        b"{{ url_for('static', filename='css/chatgpt_style.css') }}",
+        b"/static/css/chatgpt_style.css"
     )
     html = html.replace(
-        "{{ url_for('static', filename='js/chatgpt_chat.js') }}",
-        "/static/js/chatgpt_chat.js"
+        b"{{ url_for('static', filename='js/chatgpt_chat.js') }}",
+        b"/static/js/chatgpt_chat.js"
     )
     
-    return Response(html, mimetype="text/html")
+    return html, _etag(html)
+
+
+# The template is static per deploy, so render it once at import
+_TEMPLATE_BYTES, _TEMPLATE_ETAG = _build_template()
+
+
+def _get_template_bytes() -> Optional[bytes]:
+    """Return the rendered template, retrying if it was missing at import."""
+    global _TEMPLATE_BYTES, _TEMPLATE_ETAG
+    if _TEMPLATE_BYTES is None:
+        _TEMPLATE_BYTES, _TEMPLATE_ETAG = _build_template()
+    return _TEMPLATE_BYTES
+
+
+_CONTENT_TYPES = {
+    ".css": "text/css",
+    ".js": "application/javascript",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".svg": "image/svg+xml",
+    ".woff2": "font/woff2",
+}
+
+
+def _load_static_files() -> dict:
+    """Read every file under web/static once, keyed by its URL path."""
+    files = {}
+    if not _STATIC_ROOT.is_dir():
+        return files
+    
+    for file_path in _STATIC_ROOT.rglob("*"):
+        if not file_path.is_file():
+            continue
+        content = file_path.read_bytes()
+        content_type = _CONTENT_TYPES.get(file_path.suffix.lower(), "application/octet-stream")
+        files[file_path.relative_to(_STATIC_ROOT).as_posix()] = (_etag(content), content_type, content)
+    return files
+
+
+# Static assets are immutable per deploy, so serve them from memory
+_STATIC_FILES = _load_static_files()
+
+
+@app.route("/")
+def index():
+    """Serve the main page."""
+    body = _get_template_bytes()
+    
+    if body is None:
+        return "<h1>GrowthBoss AI - Template not found</h1>", 404
+    
+    not_modified = _not_modified(_TEMPLATE_ETAG)
+    if not_modified is not None:
+        return not_modified
+    
+    return Response(body, mimetype="text/html", headers={"ETag": _TEMPLATE_ETAG})
 
 
 @app.route("/static/<path:filename>")
 def static_files(filename):
     """Serve static files."""
-    file_path = project_root / "web" / "static" / filename
+    cached = _STATIC_FILES.get(filename)
     
-    if not file_path.exists():
+    if cached is None:
         return "Not found", 404
     
-    # Determine content type
-    suffix = file_path.suffix.lower()
-    content_types = {
-        ".css": "text/css",
-        ".js": "application/javascript",
-        ".png": "image/png",
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".svg": "image/svg+xml",
-    }
-    content_type = content_types.get(suffix, "application/octet-stream")
+    etag, content_type, content = cached
     
-    with open(file_path, "rb") as f:
-        content = f.read()
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
     
-    return Response(content, mimetype=content_type)
+    # Filenames aren't fingerprinted, so revalidate instead of caching blindly
+    return Response(content, mimetype=content_type, headers={"ETag": etag, "Cache-Control": "public, no-cache"})
+
+
+def _json_response(payload: dict, status: int = 200) -> Response:
+    """Serialize a payload once into compact UTF-8 bytes."""
+    return Response(orjson.dumps(payload), status=status, mimetype="application/json")
+
+
+# Last formatted timestamp as [time_ns, iso_string]
+_TS_CACHE = [0, ""]
+
+
+def _now_iso() -> str:
+    """Current ISO timestamp, reformatted at most every 100ms."""
+    now_ns = time.time_ns()
+    if now_ns - _TS_CACHE[0] > 100_000_000:
+        _TS_CACHE[0] = now_ns
+        _TS_CACHE[1] = datetime.now().isoformat()
+    return _TS_CACHE[1]
+
+
+# Health bodies keyed by (configured, error); only the timestamp varies
+_HEALTH_CACHE: Dict[tuple, bytes] = {}
 
 
 @app.route("/api/health")
 def health():
     """Health check endpoint."""
     client, error = get_openai_client()
-    return jsonify({
-        "status": "healthy" if client else "error",
-        "openai_configured": client is not None,
-        "error": error,
-        "timestamp": datetime.now().isoformat()
-    })
+    key = (client is not None, error or "")
+    
+    prefix = _HEALTH_CACHE.get(key)
+    if prefix is None:
+        static_part = orjson.dumps({
+            "status": "healthy" if client else "error",
+            "openai_configured": client is not None,
+            "error": error,
+        })
+        prefix = static_part[:-1] + b',"timestamp":"'
+        _HEALTH_CACHE[key] = prefix
+    
+    body = prefix + _now_iso().encode("ascii") + b'"}'
+    return Response(body, mimetype="application/json", headers={"Cache-Control": "max-age=5"})
+
+
+@app.route("/api/warmup")
+def warmup():
+    """Trigger cold-start initialization ahead of the first chat request."""
+    client, _ = get_openai_client()
+    return _json_response({"warm": client is not None})
+
+
+_COUNCIL_MENTORS = ("Gary Vee", "Alex Hormozi", "Iman Gadzhi")
+_SESSION_BODY_TEMPLATE = b'{"session_id":"%s"}'
 
 
 @app.route("/api/session")
 def session():
     """Get session ID."""
-    return jsonify({"session_id": str(uuid.uuid4())})
+    body = _SESSION_BODY_TEMPLATE % str(uuid.uuid4()).encode("ascii")
+    return Response(body, mimetype="application/json")
+
+
+def _sse_event(payload: dict) -> bytes:
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+def _stream_chat(client, message: str, use_council: bool, session_id: str):
+    """Server-sent events: one event per delta, then a closing metadata event."""
+    try:
+        for delta in stream_chat_with_openai(client, message, use_council):
+            yield _sse_event({"delta": delta})
+    except Exception as e:
+        yield _sse_event({"error": str(e)})
+        return
+    
+    done = {"done": True, "timestamp": _now_iso(), "session_id": session_id}
+    if use_council:
+        done["mentors"] = _COUNCIL_MENTORS
+    yield _sse_event(done)
 
 
 @app.route("/api/chat", methods=["POST"])
 def chat():
     """Chat endpoint."""
     try:
-        data = request.get_json() or {}
+        raw = request.get_data()
+        data = (orjson.loads(raw) if raw else None) or {}
         message = data.get("message", "").strip()
         use_council = data.get("use_council", False)
         session_id = data.get("session_id") or str(uuid.uuid4())
         
         if not message:
-            return jsonify({"error": "Message is required"}), 400
+            return _json_response({"error": "Message is required"}, 400)
         
         client, error = get_openai_client()
         if error:
-            return jsonify({
+            return _json_response({
                 "error": "AI system not configured",
                 "message": error
-            }), 500
+            }, 500)
+        
+        if "text/event-stream" in request.headers.get("Accept", ""):
+            # Werkzeug chunks the body itself; X-Accel-Buffering stops proxies coalescing it
+            return Response(
+                _stream_chat(client, message, use_council, session_id),
+                mimetype="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
         
         response_text = chat_with_openai(client, message, use_council)
         
         result = {
             "response": response_text,
             "sources": [],
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "session_id": session_id
         }
         
         if use_council:
-            result["mentors"] = ["Gary Vee", "Alex Hormozi", "Iman Gadzhi"]
+            result["mentors"] = _COUNCIL_MENTORS
         
-        return jsonify(result)
+        return _json_response(result)
         
+    except RequestEntityTooLarge:
+        return _json_response({"error": "Request body too large"}, 413)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _json_response({"error": str(e)}, 500)
 
 
 # This is required for Vercel
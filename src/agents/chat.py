@@ -0,0 +1,28 @@
+from typing import Callable, Dict, List, Optional
+
+from src.config import OPENAI_CHAT_MODEL
+
+
+def complete_chat(client, messages: List[Dict], temperature: float, on_token: Optional[Callable[[str], None]] = None) -> str:
+	"""Run one chat completion and return its text, streaming each delta to on_token if given."""
+	if on_token is None:
+		resp = client.chat.completions.create(
+			model=OPENAI_CHAT_MODEL,
+			messages=messages,
+			temperature=temperature,
+		)
+		return resp.choices[0].message.content.strip()
+	
+	# Stream so the caller can show text as it is generated
+	stream = client.chat.completions.create(
+		model=OPENAI_CHAT_MODEL,
+		messages=messages,
+		temperature=temperature,
+		stream=True,
+	)
+	parts = []
+	for chunk in stream:
+		if chunk.choices and chunk.choices[0].delta.content:
+			parts.append(chunk.choices[0].delta.content)
+			on_token(chunk.choices[0].delta.content)
+	return "".join(parts).strip()
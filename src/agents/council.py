@@ -1,65 +1,157 @@
-from typing import List, Dict
-from openai import OpenAI
+import functools
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from src.config import get_openai_api_key, OPENAI_CHAT_MODEL
+from src.config import get_shared_openai_client, OPENAI_CHAT_MODEL
+from src.prompts import COUNCIL_SYSTEM, DEFAULT_GROWTHBOSS_CONTEXT
 from src.agents.mentors.gary_vee import GaryVeeAgent
 from src.agents.mentors.alex_hormozi import AlexHormoziAgent
 from src.agents.mentors.iman_gadzhi import ImanGadzhiAgent
 
 
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
 class MarketingCouncil:
 	"""Orchestrates a council of marketing mentors to debate and synthesize answers."""
 	
+	# Minimum pairwise word-set Jaccard at which the mentors are treated as agreeing
+	# and the synthesis is assembled locally instead of with another OpenAI call
+	AGREEMENT_THRESHOLD = 0.75
+	
 	def __init__(self, collection_name: str):
 		self.collection_name = collection_name
-		self.gary_vee = GaryVeeAgent(collection_name)
-		self.alex_hormozi = AlexHormoziAgent(collection_name)
-		self.iman_gadzhi = ImanGadzhiAgent(collection_name)
-		self.client = OpenAI(api_key=get_openai_api_key())
+		# The council and its mentors share one client and connection pool
+		self.client = get_shared_openai_client()
+		self.gary_vee = GaryVeeAgent(collection_name, client=self.client)
+		self.alex_hormozi = AlexHormoziAgent(collection_name, client=self.client)
+		self.iman_gadzhi = ImanGadzhiAgent(collection_name, client=self.client)
 	
-	def deliberate(self, question: str, growthboss_context: str = "") -> Dict:
-		"""
-		Have each mentor research and answer, then synthesize their perspectives.
-		"""
-		# Each mentor researches independently
-		gary_response = self.gary_vee.research(question, k=6)
-		hormozi_response = self.alex_hormozi.research(question, k=6)
-		iman_response = self.iman_gadzhi.research(question, k=6)
-		
-		# Create debate and synthesis prompt
-		deliberation_prompt = (
-			"You are coordinating a Marketing Council for GrowthBoss, a marketing agency. "
-			"Three expert mentors have independently researched and answered the same question. "
-			"Their responses are below.\n\n"
-			"Your task:\n"
-			"1. Identify where they agree (consensus points)\n"
-			"2. Identify where they differ or complement each other (unique perspectives)\n"
-			"3. Synthesize the BEST answer that combines their wisdom\n"
-			"4. Provide actionable recommendations specific to GrowthBoss\n\n"
-			f"GrowthBoss Context: {growthboss_context or 'Marketing agency focused on client acquisition, offer design, content-led inbound, outbound SDR support, profitable delivery SLAs.'}\n\n"
+	def _deliberation_messages(
+		self, question: str, growthboss_context: str,
+		gary_answer: str, hormozi_answer: str, iman_answer: str,
+	) -> List[Dict]:
+		"""Build the debate and synthesis messages from the three mentor answers."""
+		user_prompt = (
+			f"GrowthBoss Context: {growthboss_context or DEFAULT_GROWTHBOSS_CONTEXT}\n\n"
 			f"Question: {question}\n\n"
 			"=== GARY VAYNERCHUK (Gary Vee) ===\n"
-			f"{gary_response['answer']}\n\n"
+			f"{gary_answer}\n\n"
 			"=== ALEX HORMOZI ===\n"
-			f"{hormozi_response['answer']}\n\n"
+			f"{hormozi_answer}\n\n"
 			"=== IMAN GADZHI ===\n"
-			f"{iman_response['answer']}\n\n"
-			"=== SYNTHESIS INSTRUCTIONS ===\n"
-			"Provide a structured synthesis:\n"
-			"1. **Executive Summary**: 2-3 sentence answer combining all perspectives\n"
-			"2. **Consensus Points**: Where all three mentors agree\n"
-			"3. **Unique Perspectives**: What each mentor adds that others don't\n"
-			"4. **GrowthBoss Recommendation**: Specific, actionable steps for GrowthBoss\n"
-			"5. **Implementation Priority**: Ranked list of next steps\n\n"
-			"Format the synthesis clearly and make it immediately actionable."
+			f"{iman_answer}"
 		)
+		return [
+			{"role": "system", "content": COUNCIL_SYSTEM},
+			{"role": "user", "content": user_prompt},
+		]
+	
+	@staticmethod
+	def _word_set(text: str) -> set:
+		return set(_WORD_RE.findall(text.lower()))
+	
+	@staticmethod
+	def _jaccard(a: set, b: set) -> float:
+		"""Word-set Jaccard similarity; an empty set matches nothing."""
+		if not a or not b:
+			return 0.0
+		return len(a & b) / len(a | b)
+	
+	def _min_similarity(self, answers: Tuple[str, ...]) -> float:
+		"""Lowest pairwise Jaccard similarity between the answers' word sets."""
+		word_sets = [self._word_set(answer) for answer in answers]
+		return min(self._jaccard(a, b) for a, b in combinations(word_sets, 2))
+	
+	def _local_synthesis(self, growthboss_context: str, responses: Tuple[Dict, ...]) -> str:
+		"""
+		Synthesis for mentors who already agree, built from their own sentences.
 		
-		resp = self.client.chat.completions.create(
-			model=OPENAI_CHAT_MODEL,
-			messages=[{"role": "user", "content": deliberation_prompt}],
-			temperature=0.5,
+		A sentence is a consensus point when every mentor has a sentence close to
+		it; the rest of each mentor's sentences are that mentor's unique perspective.
+		The GrowthBoss Recommendation section is left out when nothing is shared.
+		"""
+		sentences = [
+			[(sentence, self._word_set(sentence)) for sentence in _SENTENCE_END_RE.split(response['answer'].strip()) if sentence]
+			for response in responses
+		]
+		
+		def shared(words: set, others: List[List[Tuple[str, set]]]) -> bool:
+			return all(
+				any(self._jaccard(words, other) >= self.AGREEMENT_THRESHOLD for _, other in mentor)
+				for mentor in others
+			)
+		
+		consensus = [sentence for sentence, words in sentences[0] if shared(words, sentences[1:])]
+		unique = [
+			[sentence for sentence, words in mentor if not shared(words, sentences[:i] + sentences[i + 1:])]
+			for i, mentor in enumerate(sentences)
+		]
+		# Agreed points lead, then one distinct point from each mentor
+		priorities = (consensus[:3] + [mentor[0] for mentor in unique if mentor])[:5]
+		
+		sections = [
+			("Executive Summary", " " + (" ".join(consensus[:2]) or "Gary Vee, Alex Hormozi and Iman Gadzhi gave closely matching answers.")),
+			("Consensus Points", "\n" + ("\n".join(f"- {sentence}" for sentence in consensus) or (
+				"- The mentors gave closely matching answers without repeating any sentence outright."
+			))),
+			("Unique Perspectives", "\n" + "\n".join(
+				f"- {response['mentor']}: {' '.join(mentor[:2]) or 'Nothing beyond the consensus.'}"
+				for response, mentor in zip(responses, unique)
+			)),
+		]
+		if consensus:
+			sections.append(("GrowthBoss Recommendation", (
+				f" For GrowthBoss ({growthboss_context or DEFAULT_GROWTHBOSS_CONTEXT}), act first on the "
+				f"{len(consensus)} point{'s' if len(consensus) != 1 else ''} all three mentors agree on, "
+				"then test the unique perspectives against current clients."
+			)))
+		if priorities:
+			sections.append(("Implementation Priority", "\n" + "\n".join(
+				f"{rank}. {sentence}" for rank, sentence in enumerate(priorities, 1)
+			)))
+		return "\n\n".join(
+			f"{number}. **{heading}**:{body}" for number, (heading, body) in enumerate(sections, 1)
 		)
-		synthesis = resp.choices[0].message.content.strip()
+	
+	def _agreed_synthesis(self, growthboss_context: str, *responses: Dict) -> Optional[str]:
+		"""Local synthesis when the mentors nearly agree, otherwise None."""
+		if self._min_similarity(tuple(response['answer'] for response in responses)) >= self.AGREEMENT_THRESHOLD:
+			return self._local_synthesis(growthboss_context, responses)
+		return None
+	
+	def _consult_mentors(self, question: str) -> Tuple[Dict, Dict, Dict]:
+		"""Get the Gary Vee, Hormozi and Iman Gadzhi answers, in that order."""
+		# Each mentor researches independently; the calls are network-bound,
+		# so running them on threads costs max(T) instead of 3T
+		mentors = (self.gary_vee, self.alex_hormozi, self.iman_gadzhi)
+		with ThreadPoolExecutor(max_workers=len(mentors)) as executor:
+			return tuple(executor.map(lambda mentor: mentor.research(question, k=6), mentors))
+	
+	def deliberate(self, question: str, growthboss_context: str = "") -> Dict:
+		"""
+		Have each mentor research and answer, then synthesize their perspectives.
+		"""
+		gary_response, hormozi_response, iman_response = self._consult_mentors(question)
+		
+		synthesis = self._agreed_synthesis(growthboss_context, gary_response, hormozi_response, iman_response)
+		if synthesis is None:
+			messages = self._deliberation_messages(
+				question, growthboss_context,
+				gary_response['answer'], hormozi_response['answer'], iman_response['answer'],
+			)
+			
+			resp = self.client.chat.completions.create(
+				model=OPENAI_CHAT_MODEL,
+				messages=messages,
+				temperature=0.5,
+			)
+			synthesis = resp.choices[0].message.content.strip()
 		
 		return {
 			"synthesis": synthesis,
@@ -71,6 +163,152 @@ class MarketingCouncil:
 			"question": question,
 		}
 	
+	def stream_synthesis(self, question: str, growthboss_context: str = "") -> Iterator[str]:
+		"""
+		Yield the council synthesis as it is generated.
+		
+		The synthesis call starts as soon as the last mentor answers, so the
+		caller can show output while it is still decoding.
+		"""
+		gary_response, hormozi_response, iman_response = self._consult_mentors(question)
+		synthesis = self._agreed_synthesis(growthboss_context, gary_response, hormozi_response, iman_response)
+		if synthesis is not None:
+			yield synthesis
+			return
+		
+		messages = self._deliberation_messages(
+			question, growthboss_context,
+			gary_response['answer'], hormozi_response['answer'], iman_response['answer'],
+		)
+		stream = self.client.chat.completions.create(
+			model=OPENAI_CHAT_MODEL,
+			messages=messages,
+			temperature=0.5,
+			stream=True,
+		)
+		for chunk in stream:
+			if chunk.choices and chunk.choices[0].delta.content:
+				yield chunk.choices[0].delta.content
+	
+	def deliberate_batch(self, questions: List[str], growthboss_context: str = "", poll_interval: int = 30) -> List[Dict]:
+		"""
+		Run the council over many questions through the OpenAI Batch API.
+		
+		Meant for offline jobs (evals, report generation) where latency does not
+		matter: batch requests cost half as much and do not count against the
+		interactive rate limits. Blocks until both batches finish.
+		"""
+		if not questions:
+			return []
+		mentors = {
+			"gary_vee": self.gary_vee,
+			"alex_hormozi": self.alex_hormozi,
+			"iman_gadzhi": self.iman_gadzhi,
+		}
+		evidence = {}
+		requests = []
+		for i, question in enumerate(questions):
+			for key, mentor in mentors.items():
+				messages, ctx = mentor.build_messages(question, k=6)
+				evidence[(i, key)] = ctx
+				requests.append(self._batch_request(f"{i}-{key}", messages, mentor.TEMPERATURE))
+		answers, errors = self._run_batch(requests, poll_interval)
+		
+		# A question none of the mentors answered has nothing to synthesize
+		synthesis_requests = [
+			self._batch_request(
+				f"{i}-synthesis",
+				self._deliberation_messages(
+					question, growthboss_context,
+					answers.get(f"{i}-gary_vee", ""),
+					answers.get(f"{i}-alex_hormozi", ""),
+					answers.get(f"{i}-iman_gadzhi", ""),
+				),
+				0.5,
+			)
+			for i, question in enumerate(questions)
+			if any(answers.get(f"{i}-{key}") for key in mentors)
+		]
+		syntheses = {}
+		if synthesis_requests:
+			syntheses, synthesis_errors = self._run_batch(synthesis_requests, poll_interval)
+			errors.update(synthesis_errors)
+		
+		results = []
+		for i, question in enumerate(questions):
+			mentor_responses = {}
+			for key, mentor in mentors.items():
+				mentor_responses[key] = {
+					"answer": answers.get(f"{i}-{key}", ""),
+					"evidence": evidence[(i, key)],
+					"mentor": mentor.NAME,
+				}
+				if f"{i}-{key}" in errors:
+					mentor_responses[key]["error"] = errors[f"{i}-{key}"]
+			result = {
+				"synthesis": syntheses.get(f"{i}-synthesis", ""),
+				"mentor_responses": mentor_responses,
+				"question": question,
+			}
+			if f"{i}-synthesis" in errors:
+				result["error"] = errors[f"{i}-synthesis"]
+			elif not any(answers.get(f"{i}-{key}") for key in mentors):
+				result["error"] = "No mentor answered, synthesis skipped"
+			results.append(result)
+		return results
+	
+	@staticmethod
+	def _batch_request(custom_id: str, messages: List[Dict], temperature: float) -> Dict:
+		return {
+			"custom_id": custom_id,
+			"method": "POST",
+			"url": "/v1/chat/completions",
+			"body": {
+				"model": OPENAI_CHAT_MODEL,
+				"messages": messages,
+				"temperature": temperature,
+			},
+		}
+	
+	def _run_batch(self, requests: List[Dict], poll_interval: int) -> Tuple[Dict[str, str], Dict[str, str]]:
+		"""
+		Submit a JSONL batch and wait for it.
+		
+		Returns custom_id -> answer text for the requests that succeeded and
+		custom_id -> error message for the ones that failed.
+		"""
+		payload = "\n".join(json.dumps(r) for r in requests).encode("utf-8")
+		batch_file = self.client.files.create(file=("council_batch.jsonl", payload), purpose="batch")
+		batch = self.client.batches.create(
+			input_file_id=batch_file.id,
+			endpoint="/v1/chat/completions",
+			completion_window="24h",
+		)
+		while batch.status not in ("completed", "failed", "expired", "cancelled"):
+			time.sleep(poll_interval)
+			batch = self.client.batches.retrieve(batch.id)
+		if batch.status != "completed":
+			raise RuntimeError(f"Council batch {batch.id} ended with status {batch.status}")
+		
+		results = {}
+		errors = {}
+		# Failed requests land in the error file rather than the output file
+		for file_id in (batch.output_file_id, batch.error_file_id):
+			if not file_id:
+				continue
+			for line in self.client.files.content(file_id).text.splitlines():
+				if not line.strip():
+					continue
+				item = json.loads(line)
+				response = item.get("response") or {}
+				if response.get("status_code") != 200:
+					error = item.get("error") or (response.get("body") or {}).get("error") or {}
+					errors[item["custom_id"]] = error.get("message") or f"status {response.get('status_code')}"
+					continue
+				content = response["body"]["choices"][0]["message"]["content"] or ""
+				results[item["custom_id"]] = content.strip()
+		return results, errors
+	
 	def ask(self, question: str, growthboss_context: str = "", show_deliberation: bool = False) -> str:
 		"""
 		Main entry point - returns the council's synthesized answer.
@@ -92,3 +330,8 @@ class MarketingCouncil:
 		
 		return result["synthesis"]
 
+
+@functools.lru_cache(maxsize=8)
+def get_council(collection_name: str) -> MarketingCouncil:
+	"""Shared council per collection, so mentors are built once per process."""
+	return MarketingCouncil(collection_name)
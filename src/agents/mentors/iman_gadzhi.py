@@ -1,57 +1,54 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from openai import OpenAI
 
-from src.config import get_openai_api_key, OPENAI_CHAT_MODEL
-from src.rag.vectorstore import query
+from src.config import get_shared_openai_client, OPENAI_CHAT_MODEL
+from src.rag.vectorstore import format_context, query
+from src.prompts import IMAN_GADZHI_SYSTEM
 
 
 class ImanGadzhiAgent:
 	"""Agent representing Iman Gadzhi's perspective on agency operations and SMMA."""
 	
-	def __init__(self, collection_name: str):
+	NAME = "Iman Gadzhi"
+	
+	# Domains of Iman Gadzhi's own content; the vector store filters on these during search
+	DOMAINS = ('www.imangadzhi.com', 'imangadzhi.com')
+	# Chroma metadata filter, built once rather than per query
+	WHERE = {"domain": {"$in": list(DOMAINS)}}
+	SYSTEM_PROMPT = IMAN_GADZHI_SYSTEM
+	TEMPERATURE = 0.6
+	
+	def __init__(self, collection_name: str, client: Optional[OpenAI] = None):
 		self.collection_name = collection_name
-		self.client = OpenAI(api_key=get_openai_api_key())
-		self.persona = (
-			"You are Iman Gadzhi, founder of Agency Navigator and SMMA expert. "
-			"Your core beliefs: 1) Systematize agency operations - scripts, processes, SOPs. "
-			"2) Focus on client retention and delivery excellence. 3) Build a lean, profitable agency first. "
-			"4) Master cold outreach and email sequences. 5) Use case studies and social proof. "
-			"6) Price based on ROI, not hours. 7) Build a team systematically as you scale. "
-			"8) Focus on one niche before expanding. You're practical, process-oriented, and focus on "
-			"profitable agency operations and proven systems."
-		)
+		self.client = client or get_shared_openai_client()
 	
-	def research(self, question: str, k: int = 8) -> Dict:
-		"""Research using Iman Gadzhi's knowledge base."""
-		ctx = query(self.collection_name, question, k=k * 2)
-		# Filter to Iman Gadzhi content
-		iman_ctx = [c for c in ctx if 'gadzhi' in (c.get('metadata', {}).get('domain', '') or '').lower() or
-					'imangadzhi' in (c.get('metadata', {}).get('source', '') or '').lower()][:k]
+	def build_messages(self, question: str, k: int = 8) -> Tuple[List[Dict], List[Dict]]:
+		"""Retrieve Iman Gadzhi's context and build the chat messages."""
+		iman_ctx = query(self.collection_name, question, k=k, per_domain=k, where=self.WHERE)
 		
 		if not iman_ctx:
-			iman_ctx = ctx[:k]
+			iman_ctx = query(self.collection_name, question, k=k)  # Fallback if no specific match
 		
-		def fmt(c):
-			meta = c['metadata'] or {}
-			title = meta.get('title') or meta.get('source') or 'unknown'
-			return f"[Source: {title}]\n{c['text']}"
-		
-		context_blob = "\n\n".join([fmt(c) for c in iman_ctx])
-		prompt = (
-			f"{self.persona}\n\n"
-			"Answer the user's question from Iman Gadzhi's perspective, using the context below. "
-			"Be practical, system-focused, and emphasize agency operations, processes, and profitability. "
-			"Cite specific tactics or systems.\n\n"
+		context_blob = format_context(iman_ctx)
+		user_prompt = (
 			f"Context:\n{context_blob}\n\n"
 			f"Question: {question}\n\n"
 			"Answer as Iman Gadzhi:"
 		)
-		
+		messages = [
+			{"role": "system", "content": self.SYSTEM_PROMPT},
+			{"role": "user", "content": user_prompt},
+		]
+		return messages, iman_ctx
+	
+	def research(self, question: str, k: int = 8) -> Dict:
+		"""Research using Iman Gadzhi's knowledge base."""
+		messages, evidence = self.build_messages(question, k)
 		resp = self.client.chat.completions.create(
 			model=OPENAI_CHAT_MODEL,
-			messages=[{"role": "user", "content": prompt}],
-			temperature=0.6,
+			messages=messages,
+			temperature=self.TEMPERATURE,
 		)
 		answer = resp.choices[0].message.content.strip()
-		return {"answer": answer, "evidence": iman_ctx, "mentor": "Iman Gadzhi"}
+		return {"answer": answer, "evidence": evidence, "mentor": self.NAME}
 
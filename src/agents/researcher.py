@@ -1,9 +1,9 @@
-from typing import List, Optional
-from openai import OpenAI
+from typing import Dict, Iterator, List, Optional, Tuple
 import time
 
-from src.config import get_openai_api_key, OPENAI_CHAT_MODEL
-from src.rag.vectorstore import query
+from src.config import get_shared_openai_client, OPENAI_CHAT_MODEL
+from src.prompts import RESEARCHER_SYSTEM
+from src.rag.vectorstore import format_context, query
 from src.rag.enhanced_retrieval import enhanced_query
 from src.memory.conversation_memory import get_memory, ConversationMemory
 from src.analytics.query_tracker import get_tracker
@@ -12,18 +12,21 @@ from src.analytics.query_tracker import get_tracker
 class ResearcherAgent:
 	def __init__(self, collection_name: str, use_enhanced: bool = True, session_id: Optional[str] = None):
 		self.collection_name = collection_name
-		self.client = OpenAI(api_key=get_openai_api_key())
+		self.client = get_shared_openai_client()
 		self.use_enhanced = use_enhanced
 		self.memory = get_memory(session_id)
 		self.tracker = get_tracker()
 
-	def research(self, question: str, k: int = 12, include_context: bool = True) -> dict:
+	def _prepare(self, question: str, k: int, include_context: bool, session_id: Optional[str]) -> Tuple[List[Dict], List[Dict], ConversationMemory]:
+		"""Retrieve evidence and build the chat messages for a question."""
 		start_time = time.time()
+		# A per-call session lets one agent serve many sessions
+		memory = get_memory(session_id) if session_id else self.memory
 		
 		# Get conversation context
 		context = ""
 		if include_context:
-			context = self.memory.get_context()
+			context = memory.get_context()
 		
 		# Use enhanced retrieval if enabled
 		if self.use_enhanced:
@@ -38,37 +41,58 @@ class ResearcherAgent:
 			query=question,
 			response_time=response_time,
 			result_count=len(ctx),
-			session_id=self.memory.session_id,
+			session_id=memory.session_id,
 		)
-		def fmt(c):
-			meta = c['metadata'] or {}
-			title = meta.get('title') or meta.get('source') or 'unknown'
-			domain = meta.get('domain') or 'unknown'
-			return f"[Source: {title} | {domain}]\n{c['text']}"
-		context_blob = "\n\n".join([fmt(c) for c in ctx])
+		context_blob = format_context(ctx, with_domain=True)
 		# Build prompt with conversation context
-		prompt_parts = [
-			"You are a marketing researcher analyzing teachings from Gary Vaynerchuk, Alex Hormozi, and Iman Gadzhi. "
-			"Summarize the most relevant insights to answer the user's question. "
-			"Cite sources inline as (source). Be concise and actionable.",
-		]
+		prompt_parts = []
 		
 		if context:
-			prompt_parts.append(f"\n{context}")
+			prompt_parts.append(context)
 		
-		prompt_parts.append(f"\nRetrieved Context:\n{context_blob}\n\nQuestion: {question}\n\nAnswer:")
+		prompt_parts.append(f"Retrieved Context:\n{context_blob}\n\nQuestion: {question}\n\nAnswer:")
 		
-		prompt = "\n".join(prompt_parts)
+		prompt = "\n\n".join(prompt_parts)
+		messages = [
+			{"role": "system", "content": RESEARCHER_SYSTEM},
+			{"role": "user", "content": prompt},
+		]
+		return messages, ctx, memory
+
+	def research(self, question: str, k: int = 12, include_context: bool = True, session_id: Optional[str] = None) -> dict:
+		messages, ctx, memory = self._prepare(question, k, include_context, session_id)
 		resp = self.client.chat.completions.create(
 			model=OPENAI_CHAT_MODEL,
-			messages=[{"role": "user", "content": prompt}],
+			messages=messages,
 			temperature=0.2,
 		)
 		answer = resp.choices[0].message.content.strip()
 		
 		# Save to memory
-		self.memory.add_exchange(question, answer, metadata={'result_count': len(ctx)})
+		memory.add_exchange(question, answer, metadata={'result_count': len(ctx)})
 		
-		return {"answer": answer, "evidence": ctx, "session_id": self.memory.session_id}
-
+		return {"answer": answer, "evidence": ctx, "session_id": memory.session_id}
 
+	def research_stream(self, question: str, k: int = 12, include_context: bool = True, session_id: Optional[str] = None) -> Tuple[List[Dict], Iterator[str]]:
+		"""
+		Retrieve evidence now and return it with an iterator over answer deltas.
+		
+		The exchange is saved to memory once the iterator is exhausted.
+		"""
+		messages, ctx, memory = self._prepare(question, k, include_context, session_id)
+		
+		def deltas():
+			stream = self.client.chat.completions.create(
+				model=OPENAI_CHAT_MODEL,
+				messages=messages,
+				temperature=0.2,
+				stream=True,
+			)
+			parts = []
+			for chunk in stream:
+				if chunk.choices and chunk.choices[0].delta.content:
+					parts.append(chunk.choices[0].delta.content)
+					yield chunk.choices[0].delta.content
+			memory.add_exchange(question, "".join(parts).strip(), metadata={'result_count': len(ctx)})
+		
+		return ctx, deltas()
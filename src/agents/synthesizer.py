@@ -1,26 +1,22 @@
-from openai import OpenAI
+from typing import Callable, Optional
 
-from src.config import get_openai_api_key, OPENAI_CHAT_MODEL
+from src.agents.chat import complete_chat
+from src.config import get_shared_openai_client
+from src.prompts import SYNTHESIZER_SYSTEM, SYNTHESIZER_USER_TEMPLATE
 
 
 class SynthesizerAgent:
 	def __init__(self):
-		self.client = OpenAI(api_key=get_openai_api_key())
+		self.client = get_shared_openai_client()
 
-	def synthesize(self, question: str, research_answer: str, brand_context: str) -> str:
-		prompt = (
-			"You are a senior marketing strategist at GrowthBoss. Blend the research with our context to produce a clear, actionable plan. "
-			"Return structured output with sections: Objective, Core Insight, Strategy, Tactics, Content Plan, Offers, KPIs, Risks, Next Steps.\n\n"
-			f"GrowthBoss Context:\n{brand_context}\n\n"
-			f"User Question:\n{question}\n\n"
-			f"Research Summary:\n{research_answer}\n\n"
-			"Now produce the plan:"
+	def synthesize(self, question: str, research_answer: str, brand_context: str, on_token: Optional[Callable[[str], None]] = None) -> str:
+		prompt = SYNTHESIZER_USER_TEMPLATE.format(
+			brand_context=brand_context,
+			question=question,
+			research_answer=research_answer,
 		)
-		resp = self.client.chat.completions.create(
-			model=OPENAI_CHAT_MODEL,
-			messages=[{"role": "user", "content": prompt}],
-			temperature=0.3,
-		)
-		return resp.choices[0].message.content.strip()
-
-
+		messages = [
+			{"role": "system", "content": SYNTHESIZER_SYSTEM},
+			{"role": "user", "content": prompt},
+		]
+		return complete_chat(self.client, messages, 0.3, on_token)
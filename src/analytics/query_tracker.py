@@ -3,54 +3,210 @@ Query analytics and tracking system.
 10x improvement: Data-driven insights for continuous improvement.
 """
 
+import atexit
 import json
 import os
-from typing import List, Dict, Optional
-from datetime import datetime
+import sys
+import threading
+import time
+from typing import BinaryIO, Deque, List, Dict, Optional
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
+
+try:
+	import orjson
+	
+	_dumps = orjson.dumps
+	_loads = orjson.loads
+except ImportError:  # Fall back to the stdlib encoder
+	def _dumps(obj) -> bytes:
+		return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+	
+	_loads = json.loads
 
 ANALYTICS_DIR = Path("data/analytics")
 ANALYTICS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Queries kept in memory and, after compaction, on disk
+MAX_QUERIES = 1000
+# Thresholds for flagging knowledge gaps and slow queries in insights
+KNOWLEDGE_GAP_RESULTS = 3
+SLOW_QUERY_SECONDS = 5.0
+
+
+def _mtime(path: Path) -> Optional[int]:
+	"""Modification time of a non-empty file, or None if it is missing or empty."""
+	try:
+		st = os.stat(path)
+	except FileNotFoundError:
+		return None
+	return st.st_mtime_ns if st.st_size else None
+
 
 class QueryTracker:
 	"""Tracks queries and performance metrics."""
 	
+	# Writes happen on a background thread, coalesced: it wakes once this many
+	# queries are pending, or every FLUSH_INTERVAL seconds
+	FLUSH_EVERY = 20
+	FLUSH_INTERVAL = 30.0
+	
 	def __init__(self):
-		self.queries_file = ANALYTICS_DIR / "queries.json"
+		# One JSON object per line, so new queries are appended rather than
+		# rewriting the whole history
+		self.queries_file = ANALYTICS_DIR / "queries.jsonl"
+		self.legacy_queries_file = ANALYTICS_DIR / "queries.json"
 		self.metrics_file = ANALYTICS_DIR / "metrics.json"
-		self.queries: List[Dict] = []
-		self.metrics: Dict = defaultdict(int)
+		self._pending: List[Dict] = []
+		self._queries_fh: Optional[BinaryIO] = None
+		# _lock guards the in-memory state; _io_lock serialises disk writes so
+		# track_query never waits on the filesystem
+		self._lock = threading.Lock()
+		self._io_lock = threading.Lock()
+		self._wakeup = threading.Event()
+		self._reset()
 		self._load()
+		threading.Thread(target=self._write_loop, name='query-tracker-writer', daemon=True).start()
+		atexit.register(self.flush)
+	
+	def _reset(self):
+		"""Clear everything loaded from disk."""
+		self.queries: Deque[Dict] = deque(maxlen=MAX_QUERIES)
+		self.metrics: Dict = defaultdict(int)
+		# Running aggregates over self.queries, adjusted as entries enter and leave
+		self._query_counts: Counter = Counter()
+		self._session_counts: Counter = Counter()
+		self._knowledge_gaps = 0
+		self._slow_queries = 0
+		self._lines_on_disk = 0
+		# File versions last read or written, to tell when another process wrote
+		self._queries_mtime: Optional[int] = None
+		self._metrics_mtime: Optional[int] = None
+		if self._queries_fh is not None:
+			self._queries_fh.close()
+			self._queries_fh = None
 	
 	def _load(self):
 		"""Load analytics data."""
-		if self.queries_file.exists():
+		self._queries_mtime = _mtime(self.queries_file)
+		if self._queries_mtime is not None:
+			try:
+				with open(self.queries_file, 'rb') as f:
+					for line in f:
+						if line.strip():
+							self.queries.append(_loads(line))
+							self._lines_on_disk += 1
+			except Exception:
+				self.queries.clear()
+		elif _mtime(self.legacy_queries_file) is not None:
 			try:
-				with open(self.queries_file, 'r', encoding='utf-8') as f:
-					self.queries = json.load(f)
+				with open(self.legacy_queries_file, 'rb') as f:
+					self.queries.extend(_loads(f.read()))
+				self._lines_on_disk = MAX_QUERIES + 1  # Force a rewrite into the JSONL file
 			except Exception:
-				self.queries = []
+				self.queries.clear()
 		
-		if self.metrics_file.exists():
+		if self._lines_on_disk > MAX_QUERIES:
+			self._compact(list(self.queries))
+		
+		for entry in self.queries:
+			# Repeated queries and session ids share one string object
+			entry['query'] = sys.intern(entry['query'])
+			if entry.get('session_id'):
+				entry['session_id'] = sys.intern(entry['session_id'])
+			self._count(entry, 1)
+		
+		self._metrics_mtime = _mtime(self.metrics_file)
+		if self._metrics_mtime is not None:
 			try:
-				with open(self.metrics_file, 'r', encoding='utf-8') as f:
-					self.metrics = json.load(f)
+				with open(self.metrics_file, 'rb') as f:
+					self.metrics = _loads(f.read())
 			except Exception:
 				self.metrics = defaultdict(int)
 	
-	def _save(self):
-		"""Save analytics data."""
+	def _count(self, entry: Dict, delta: int):
+		"""Add an entry to (delta=1) or remove it from (delta=-1) the running aggregates."""
+		self._query_counts[entry['query']] += delta
+		if self._query_counts[entry['query']] <= 0:
+			del self._query_counts[entry['query']]
+		session_id = entry.get('session_id')
+		if session_id:
+			self._session_counts[session_id] += delta
+			if self._session_counts[session_id] <= 0:
+				del self._session_counts[session_id]
+		if entry.get('result_count', 0) < KNOWLEDGE_GAP_RESULTS:
+			self._knowledge_gaps += delta
+		if entry.get('response_time', 0) > SLOW_QUERY_SECONDS:
+			self._slow_queries += delta
+	
+	def _compact(self, entries: List[Dict]):
+		"""Rewrite the query log with only the given (in-memory) entries."""
 		try:
-			with open(self.queries_file, 'w', encoding='utf-8') as f:
-				json.dump(self.queries[-1000:], f, ensure_ascii=False, indent=2)  # Keep last 1000
+			if self._queries_fh is not None:
+				self._queries_fh.close()
+				self._queries_fh = None
+			tmp_file = self.queries_file.with_suffix('.jsonl.tmp')
+			with open(tmp_file, 'wb') as f:
+				f.write(b''.join(_dumps(e) + b'\n' for e in entries))
+			os.replace(tmp_file, self.queries_file)
+			self._lines_on_disk = len(entries)
+			self._queries_mtime = _mtime(self.queries_file)
+		except Exception:
+			pass
+	
+	def _save(self, batch: List[Dict], metrics: Dict, entries: Optional[List[Dict]] = None):
+		"""Append a batch of queries (or compact to entries) and rewrite the (small) metrics file."""
+		try:
+			if entries is not None:
+				self._compact(entries)
+			else:
+				if self._queries_fh is None:
+					self._queries_fh = open(self.queries_file, 'ab')
+				# Build the batch in memory and hand it to the OS in one write
+				self._queries_fh.write(b''.join(_dumps(e) + b'\n' for e in batch))
+				self._queries_fh.flush()
+				self._lines_on_disk += len(batch)
 			
-			with open(self.metrics_file, 'w', encoding='utf-8') as f:
-				json.dump(dict(self.metrics), f, ensure_ascii=False, indent=2)
+			with open(self.metrics_file, 'wb') as f:
+				f.write(_dumps(metrics))
+			self._queries_mtime = _mtime(self.queries_file)
+			self._metrics_mtime = _mtime(self.metrics_file)
 		except Exception:
 			pass
 	
+	def refresh(self):
+		"""Reload from disk if another process has written since the last load or save."""
+		with self._io_lock:
+			if (_mtime(self.queries_file), _mtime(self.metrics_file)) == (self._queries_mtime, self._metrics_mtime):
+				return
+			self._flush_io()
+			with self._lock:
+				self._reset()
+				self._load()
+	
+	def flush(self):
+		"""Write any unsaved queries and metrics to disk."""
+		with self._io_lock:
+			self._flush_io()
+	
+	def _flush_io(self):
+		# Snapshot under the lock, then write without holding it
+		with self._lock:
+			if not self._pending:
+				return
+			batch, self._pending = self._pending, []
+			metrics = dict(self.metrics)
+			# Compact from the same snapshot so no entry is written twice
+			entries = list(self.queries) if self._lines_on_disk + len(batch) > 2 * MAX_QUERIES else None
+		self._save(batch, metrics, entries)
+	
+	def _write_loop(self):
+		"""Background writer: flush when woken by track_query or every FLUSH_INTERVAL."""
+		while True:
+			self._wakeup.wait(self.FLUSH_INTERVAL)
+			self._wakeup.clear()
+			self.flush()
+	
 	def track_query(
 		self,
 		query: str,
@@ -61,59 +217,48 @@ class QueryTracker:
 	):
 		"""Track a query and its performance."""
 		entry = {
-			'timestamp': datetime.now().isoformat(),
-			'query': query,
+			'timestamp': time.time(),  # Epoch seconds; format at read time
+			'query': sys.intern(query),
 			'response_time': response_time,
 			'result_count': result_count,
-			'session_id': session_id,
+			'session_id': sys.intern(session_id) if session_id else session_id,
 			'metadata': metadata or {},
 		}
-		self.queries.append(entry)
-		
-		# Update metrics
-		self.metrics['total_queries'] += 1
-		self.metrics['avg_response_time'] = (
-			(self.metrics.get('avg_response_time', 0) * (self.metrics['total_queries'] - 1) + response_time)
-			/ self.metrics['total_queries']
-		)
-		
-		self._save()
+		with self._lock:
+			if len(self.queries) == self.queries.maxlen:
+				self._count(self.queries[0], -1)  # About to be evicted
+			self.queries.append(entry)
+			self._count(entry, 1)
+			self._pending.append(entry)
+			
+			# Update metrics
+			self.metrics['total_queries'] = self.metrics.get('total_queries', 0) + 1
+			self.metrics['avg_response_time'] = (
+				(self.metrics.get('avg_response_time', 0) * (self.metrics['total_queries'] - 1) + response_time)
+				/ self.metrics['total_queries']
+			)
+			
+			if len(self._pending) >= self.FLUSH_EVERY:
+				self._wakeup.set()
 	
 	def get_top_queries(self, limit: int = 10) -> List[Dict]:
 		"""Get most common queries."""
-		query_counts = defaultdict(int)
-		for entry in self.queries:
-			query_counts[entry['query']] += 1
-		
-		top = sorted(query_counts.items(), key=lambda x: x[1], reverse=True)[:limit]
-		return [{'query': q, 'count': c} for q, c in top]
+		return [{'query': q, 'count': c} for q, c in self._query_counts.most_common(limit)]
 	
 	def get_metrics(self) -> Dict:
 		"""Get performance metrics."""
 		return {
 			'total_queries': self.metrics.get('total_queries', 0),
 			'avg_response_time': round(self.metrics.get('avg_response_time', 0), 2),
-			'unique_queries': len(set(e['query'] for e in self.queries)),
-			'active_sessions': len(set(e['session_id'] for e in self.queries if e.get('session_id'))),
+			'unique_queries': len(self._query_counts),
+			'active_sessions': len(self._session_counts),
 		}
 	
 	def get_insights(self) -> Dict:
 		"""Get insights from query patterns."""
-		# Find knowledge gaps (queries with low result counts)
-		low_result_queries = [
-			e for e in self.queries
-			if e.get('result_count', 0) < 3
-		]
-		
-		# Find slow queries
-		slow_queries = [
-			e for e in self.queries
-			if e.get('response_time', 0) > 5.0
-		]
-		
 		return {
-			'knowledge_gaps': len(low_result_queries),
-			'slow_queries': len(slow_queries),
+			'knowledge_gaps': self._knowledge_gaps,
+			'slow_queries': self._slow_queries,
 			'top_queries': self.get_top_queries(5),
 			'recommendations': self._generate_recommendations(),
 		}
@@ -1,21 +1,23 @@
 import argparse
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
 from rich import print
+from rich.markup import escape
 
-from src.ingest.crawl import run_crawl
-from src.ingest.ingest import chunk_and_save
-from src.rag.vectorstore import build_vectorstore, query
-from src.agents.researcher import ResearcherAgent
-from src.agents.synthesizer import SynthesizerAgent
-from src.agents.critic import CriticAgent
-from src.agents.council import MarketingCouncil
+from src.prompts import DEFAULT_GROWTHBOSS_CONTEXT
 
 
 DEFAULT_COLLECTION = "growthboss-rag"
 
 
 def cmd_ingest(args: argparse.Namespace) -> None:
+	# Commands import their own dependencies so --help doesn't load openai/chromadb
+	from src.ingest.crawl import run_crawl
+	from src.ingest.ingest import chunk_and_save
+	from src.rag.vectorstore import build_vectorstore
+
 	print("[bold green]Crawling sources...[/bold green]")
 	sources_path = args.sources or os.path.join("src", "ingest", "sources.yaml")
 	saved_raw = run_crawl(sources_path)
@@ -32,12 +34,15 @@ def cmd_ingest(args: argparse.Namespace) -> None:
 
 
 def cmd_ask(args: argparse.Namespace) -> None:
+	from src.agents.council import get_council
+	from src.agents.researcher import ResearcherAgent
+
 	collection = args.collection or DEFAULT_COLLECTION
 	
 	if args.council:
 		# Use Marketing Council
-		council = MarketingCouncil(collection)
-		context = args.context or "GrowthBoss: Marketing agency focused on client acquisition, offer design, content-led inbound, outbound SDR support, profitable delivery SLAs."
+		council = get_council(collection)
+		context = args.context or DEFAULT_GROWTHBOSS_CONTEXT
 		answer = council.ask(args.q, context, show_deliberation=args.show_deliberation)
 		print("\n[bold magenta]🎯 Marketing Council Answer[/bold magenta]\n")
 		print(answer)
@@ -56,10 +61,12 @@ def cmd_ask(args: argparse.Namespace) -> None:
 
 def cmd_council(args: argparse.Namespace) -> None:
 	"""Ask the Marketing Council - mentors debate and synthesize answers."""
+	from src.agents.council import get_council
+
 	collection = args.collection or DEFAULT_COLLECTION
-	council = MarketingCouncil(collection)
+	council = get_council(collection)
 	
-	context = args.context or "GrowthBoss: Marketing agency focused on client acquisition, offer design, content-led inbound, outbound SDR support, profitable delivery SLAs."
+	context = args.context or DEFAULT_GROWTHBOSS_CONTEXT
 	
 	print("\n[bold yellow]🧠 Consulting Marketing Council...[/bold yellow]")
 	print("[dim]Gary Vee, Alex Hormozi, and Iman Gadzhi are deliberating...[/dim]\n")
@@ -73,19 +80,52 @@ def cmd_council(args: argparse.Namespace) -> None:
 	print("\n" + "="*80)
 
 
+def _write_token(text: str) -> None:
+	sys.stdout.write(text)
+	sys.stdout.flush()
+
+
+def _build_brief(topic: str, context: str, collection: str) -> str:
+	from src.agents.critic import CriticAgent
+	from src.agents.researcher import ResearcherAgent
+	from src.agents.synthesizer import SynthesizerAgent
+
+	res = ResearcherAgent(collection).research(topic, k=12)
+	planner = SynthesizerAgent().synthesize(topic, res["answer"], context)
+	return CriticAgent().critique(planner)
+
+
 def cmd_brief(args: argparse.Namespace) -> None:
+	from src.agents.critic import CriticAgent
+	from src.agents.researcher import ResearcherAgent
+	from src.agents.synthesizer import SynthesizerAgent
+
 	collection = args.collection or DEFAULT_COLLECTION
+	
+	if len(args.topic) > 1:
+		# Each brief's stages are sequential, but separate briefs only wait on
+		# the network, so run them side by side and print in topic order
+		with ThreadPoolExecutor(max_workers=min(len(args.topic), 4)) as executor:
+			briefs = executor.map(lambda topic: _build_brief(topic, args.context, collection), args.topic)
+			for topic, brief in zip(args.topic, briefs):
+				print(f"\n[bold magenta]GrowthBoss Strategic Brief: {escape(topic)}[/bold magenta]\n")
+				sys.stdout.write(brief + "\n")
+		return
+	
+	topic = args.topic[0]
 	researcher = ResearcherAgent(collection)
-	res = researcher.research(args.topic, k=12)
+	res = researcher.research(topic, k=12)
 
+	# Both drafts stream to the terminal; the plain write keeps rich from
+	# parsing brackets in generated text as markup
+	print("\n[dim]Draft plan[/dim]\n")
 	synth = SynthesizerAgent()
-	planner = synth.synthesize(args.topic, res["answer"], args.context)
+	planner = synth.synthesize(topic, res["answer"], args.context, on_token=_write_token)
 
+	print("\n\n[bold magenta]GrowthBoss Strategic Brief[/bold magenta]\n")
 	critic = CriticAgent()
-	improved = critic.critique(planner)
-
-	print("\n[bold magenta]GrowthBoss Strategic Brief[/bold magenta]\n")
-	print(improved)
+	critic.critique(planner, on_token=_write_token)
+	sys.stdout.write("\n")
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -115,7 +155,7 @@ def build_parser() -> argparse.ArgumentParser:
 	pc.set_defaults(func=cmd_council)
 
 	pb = sub.add_parser("brief", help="Generate GrowthBoss strategic brief")
-	pb.add_argument("--topic", required=True, help="Brief topic or goal")
+	pb.add_argument("--topic", required=True, action="append", help="Brief topic or goal (repeat to generate several briefs in parallel)")
 	pb.add_argument("--context", default="Our focus: agency client acquisition, offer design, content-led inbound, outbound SDR support, profitable delivery SLAs.")
 	pb.add_argument("--collection", help="Vector store collection name")
 	pb.set_defaults(func=cmd_brief)
@@ -9,10 +9,7 @@ from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 
-from src.agents.researcher import ResearcherAgent
-from src.agents.council import MarketingCouncil
-from src.analytics.query_tracker import get_tracker
-from src.memory.conversation_memory import get_memory
+from src.prompts import DEFAULT_GROWTHBOSS_CONTEXT
 
 console = Console()
 
@@ -21,7 +18,11 @@ DEFAULT_COLLECTION = "growthboss-rag"
 
 def cmd_analytics(args: argparse.Namespace):
 	"""Show analytics dashboard."""
+	# Commands import their own dependencies so --help doesn't load openai/chromadb
+	from src.analytics.query_tracker import get_tracker
+	
 	tracker = get_tracker()
+	tracker.refresh()  # Pick up queries logged by other processes
 	metrics = tracker.get_metrics()
 	insights = tracker.get_insights()
 	
@@ -60,11 +61,15 @@ def cmd_analytics(args: argparse.Namespace):
 
 def cmd_ask_enhanced(args: argparse.Namespace):
 	"""Enhanced ask command with memory and analytics."""
+	from src.agents.council import get_council
+	from src.agents.researcher import ResearcherAgent
+	from src.memory.conversation_memory import get_memory
+	
 	memory = get_memory(args.session_id)
 	
 	if args.council:
-		council = MarketingCouncil(args.collection or DEFAULT_COLLECTION)
-		context = args.context or "GrowthBoss: Marketing agency"
+		council = get_council(args.collection or DEFAULT_COLLECTION)
+		context = args.context or DEFAULT_GROWTHBOSS_CONTEXT
 		
 		print("\n[bold magenta]🧠 Consulting Marketing Council...[/bold magenta]")
 		answer = council.ask(
@@ -116,18 +121,18 @@ def main():
 	ask_parser.add_argument("--show-evidence", action="store_true")
 	ask_parser.add_argument("--enhanced", action="store_true", default=True, help="Use enhanced retrieval")
 	ask_parser.add_argument("--session-id", help="Session ID for conversation memory")
+	ask_parser.set_defaults(func=cmd_ask_enhanced)
 	
 	# Analytics command
 	analytics_parser = subparsers.add_parser("analytics", help="Show analytics dashboard")
+	analytics_parser.set_defaults(func=cmd_analytics)
 	
 	args = parser.parse_args()
 	
-	if args.command == "ask":
-		cmd_ask_enhanced(args)
-	elif args.command == "analytics":
-		cmd_analytics(args)
-	else:
+	if not args.command:
 		parser.print_help()
+		return
+	args.func(args)
 
 
 if __name__ == "__main__":
@@ -7,6 +7,7 @@ from src.clickup.integration import (
 	get_clickup_client,
 	upload_local_document_to_clickup,
 	sync_local_document_to_clickup,
+	sync_local_directory_to_clickup,
 )
 
 __all__ = [
@@ -14,5 +15,6 @@ __all__ = [
 	"get_clickup_client",
 	"upload_local_document_to_clickup",
 	"sync_local_document_to_clickup",
+	"sync_local_directory_to_clickup",
 ]
 
@@ -62,8 +62,7 @@ def cmd_create_document(args):
 	
 	# Read content from file if provided, otherwise use content arg
 	if args.file:
-		with open(args.file, 'r', encoding='utf-8') as f:
-			content = f.read()
+		content = Path(args.file).read_text(encoding='utf-8')
 		name = args.name or Path(args.file).stem
 	else:
 		content = args.content or ""
@@ -88,8 +87,7 @@ def cmd_update_document(args):
 	
 	# Read content from file if provided, otherwise use content arg
 	if args.file:
-		with open(args.file, 'r', encoding='utf-8') as f:
-			content = f.read()
+		content = Path(args.file).read_text(encoding='utf-8')
 	else:
 		content = args.content
 	
@@ -128,8 +126,7 @@ def cmd_sync_document(args):
 	client = get_clickup_client(api_token=args.token)
 	
 	# Read local file
-	with open(args.file, 'r', encoding='utf-8') as f:
-		content = f.read()
+	content = Path(args.file).read_text(encoding='utf-8')
 	
 	name = args.name or Path(args.file).stem
 	doc = client.sync_document(args.folder_id, name, content, create_if_missing=True)
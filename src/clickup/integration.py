@@ -5,14 +5,35 @@ Comprehensive integration for managing ClickUp documents, tasks, and workflows.
 
 import os
 import json
+import threading
+import time
 import requests
-from typing import List, Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Iterator, List, Dict, Optional, Any
 from datetime import datetime
+from pathlib import Path
+
+try:
+	import orjson
+	
+	_dumps = orjson.dumps
+except ImportError:  # Fall back to the stdlib encoder
+	def _dumps(obj) -> bytes:
+		return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
 
 
 class ClickUpIntegration:
 	"""Comprehensive ClickUp API integration for reading and writing documents."""
 	
+	# Concurrent requests for the *_bulk fan-out helpers (below the session pool size)
+	MAX_PARALLEL_REQUESTS = 10
+	# Seconds a GET response is reused; tasks change more often than the hierarchy
+	CACHE_TTL = 300.0
+	TASK_CACHE_TTL = 30.0
+	# ClickUp returns at most this many tasks per page
+	TASK_PAGE_SIZE = 100
+	
 	def __init__(self, api_token: Optional[str] = None, team_id: Optional[str] = None):
 		"""
 		Initialize ClickUp integration.
@@ -32,30 +53,64 @@ class ClickUpIntegration:
 			"Authorization": self.api_token,
 			"Content-Type": "application/json"
 		}
+		
+		# One pooled session so sequential calls reuse the TLS connection
+		self._session = requests.Session()
+		self._session.headers.update(self.headers)
+		self._session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+		# (endpoint, params) -> (expires_at, response); stale entries are kept as an error fallback
+		self._get_cache: Dict[tuple, tuple] = {}
+		self._cache_lock = threading.Lock()
+	
+	def close(self):
+		"""Close pooled connections."""
+		self._session.close()
+	
+	def __enter__(self):
+		return self
+	
+	def __exit__(self, *exc_info):
+		self.close()
 	
 	def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Dict:
-		"""Make API request to ClickUp."""
+		"""Make API request to ClickUp. GET responses are cached for a short TTL."""
+		method = method.upper()
+		if method not in ("GET", "POST", "PUT", "DELETE"):
+			raise ValueError(f"Unsupported HTTP method: {method}")
 		url = f"{self.base_url}/{endpoint}"
+		# Encode the body ourselves (self.headers already sets the JSON content type)
+		body = _dumps(data) if data is not None else None
+		
+		cache_key = (endpoint, tuple(sorted(params.items())) if params else ())
+		cached = self._get_cache.get(cache_key) if method == "GET" else None
+		if cached is not None and cached[0] > time.monotonic():
+			return cached[1]
 		
 		try:
-			if method.upper() == "GET":
-				response = requests.get(url, headers=self.headers, params=params, timeout=30)
-			elif method.upper() == "POST":
-				response = requests.post(url, headers=self.headers, json=data, params=params, timeout=30)
-			elif method.upper() == "PUT":
-				response = requests.put(url, headers=self.headers, json=data, params=params, timeout=30)
-			elif method.upper() == "DELETE":
-				response = requests.delete(url, headers=self.headers, params=params, timeout=30)
-			else:
-				raise ValueError(f"Unsupported HTTP method: {method}")
-			
+			response = self._session.request(method, url, data=body, params=params, timeout=30)
 			response.raise_for_status()
-			return response.json()
+			result = response.json()
 		except requests.exceptions.RequestException as e:
+			if cached is not None:
+				return cached[1]  # Serve the stale copy rather than fail
 			error_msg = f"ClickUp API error: {e}"
 			if hasattr(e.response, 'text'):
 				error_msg += f" - Response: {e.response.text}"
 			raise Exception(error_msg)
+		
+		with self._cache_lock:
+			if method == "GET":
+				ttl = self.TASK_CACHE_TTL if endpoint.endswith("/task") else self.CACHE_TTL
+				self._get_cache[cache_key] = (time.monotonic() + ttl, result)
+			else:
+				# Writes can change any listing (names, parents), so drop everything
+				self._get_cache.clear()
+		return result
+	
+	def clear_cache(self):
+		"""Forget cached GET responses."""
+		with self._cache_lock:
+			self._get_cache.clear()
 	
 	# ==================== DOCUMENTS ====================
 	# Note: ClickUp document API may vary. These methods attempt to work with available endpoints.
@@ -283,6 +338,48 @@ class ClickUpIntegration:
 			print(f"Error fetching tasks: {e}")
 			return []
 	
+	def get_tasks_bulk(self, list_ids: List[str], include_closed: bool = False) -> Dict[str, List[Dict]]:
+		"""
+		Get tasks from several lists concurrently.
+		
+		Args:
+			list_ids: ClickUp list IDs
+			include_closed: Include closed tasks
+		
+		Returns:
+			Mapping of list ID to its task dictionaries
+		"""
+		return self._fan_out(lambda list_id: self.get_tasks(list_id, include_closed), list_ids)
+	
+	def iter_tasks(self, list_id: str, include_closed: bool = False) -> Iterator[Dict]:
+		"""
+		Yield every task in a list, following ClickUp's pagination.
+		
+		Args:
+			list_id: ClickUp list ID
+			include_closed: Include closed tasks
+		
+		Yields:
+			Task dictionaries, page by page
+		"""
+		page = 0
+		while True:
+			try:
+				params = {"archived": "false", "include_closed": str(include_closed).lower(), "page": page}
+				response = self._make_request("GET", f"list/{list_id}/task", params=params)
+			except Exception as e:
+				print(f"Error fetching tasks: {e}")
+				return
+			tasks = response.get("tasks", [])
+			yield from tasks
+			if response.get("last_page", len(tasks) < self.TASK_PAGE_SIZE):
+				return
+			page += 1
+	
+	def get_all_tasks_bulk(self, list_ids: List[str], include_closed: bool = False) -> Dict[str, List[Dict]]:
+		"""Get every page of tasks from several lists concurrently, keyed by list ID."""
+		return self._fan_out(lambda list_id: list(self.iter_tasks(list_id, include_closed)), list_ids)
+	
 	def create_task(
 		self,
 		list_id: str,
@@ -391,6 +488,17 @@ class ClickUpIntegration:
 			print(f"Error fetching lists: {e}")
 			return []
 	
+	def get_lists_bulk(self, folder_ids: List[str]) -> Dict[str, List[Dict]]:
+		"""Get the lists of several folders concurrently, keyed by folder ID."""
+		return self._fan_out(self.get_lists, folder_ids)
+	
+	def _fan_out(self, fetch, ids: List[str]) -> Dict[str, List[Dict]]:
+		"""Run independent GETs on a thread pool; they share the session's connection pool."""
+		if len(ids) <= 1:
+			return {i: fetch(i) for i in ids}
+		with ThreadPoolExecutor(max_workers=min(self.MAX_PARALLEL_REQUESTS, len(ids))) as pool:
+			return dict(zip(ids, pool.map(fetch, ids)))
+	
 	# ==================== UTILITY METHODS ====================
 	
 	def find_folder_by_name(self, space_id: str, folder_name: str) -> Optional[Dict]:
@@ -436,7 +544,6 @@ class ClickUpIntegration:
 		"""
 		try:
 			import os
-			from pathlib import Path
 			
 			path = Path(file_path)
 			if not path.exists():
@@ -445,8 +552,7 @@ class ClickUpIntegration:
 			name = document_name or path.stem
 			
 			# Read file content
-			with open(path, 'r', encoding='utf-8') as f:
-				content = f.read()
+			content = path.read_text(encoding='utf-8')
 			
 			# Determine content type
 			ext = path.suffix.lower()
@@ -505,10 +611,11 @@ def get_clickup_client(api_token: Optional[str] = None, team_id: Optional[str] =
 def upload_local_document_to_clickup(
 	folder_id: str,
 	file_path: str,
-	api_token: Optional[str] = None
+	api_token: Optional[str] = None,
+	client: Optional[ClickUpIntegration] = None
 ) -> Optional[Dict]:
-	"""Upload a local document to ClickUp."""
-	client = get_clickup_client(api_token=api_token)
+	"""Upload a local document to ClickUp. Pass client to reuse its connection pool across calls."""
+	client = client or get_clickup_client(api_token=api_token)
 	return client.upload_document_from_file(folder_id, file_path)
 
 
@@ -516,14 +623,39 @@ def sync_local_document_to_clickup(
 	folder_id: str,
 	document_name: str,
 	file_path: str,
-	api_token: Optional[str] = None
+	api_token: Optional[str] = None,
+	client: Optional[ClickUpIntegration] = None
 ) -> Optional[Dict]:
-	"""Sync a local document to ClickUp (create or update)."""
-	client = get_clickup_client(api_token=api_token)
+	"""Sync a local document to ClickUp (create or update). Pass client to reuse its connection pool across calls."""
+	client = client or get_clickup_client(api_token=api_token)
 	
 	# Read local file
-	with open(file_path, 'r', encoding='utf-8') as f:
-		content = f.read()
+	content = Path(file_path).read_text(encoding='utf-8')
 	
 	return client.sync_document(folder_id, document_name, content, create_if_missing=True)
 
+
+def sync_local_directory_to_clickup(
+	folder_id: str,
+	file_paths: List[str],
+	api_token: Optional[str] = None,
+	client: Optional[ClickUpIntegration] = None
+) -> Dict[str, Optional[Dict]]:
+	"""
+	Sync several local documents to ClickUp in parallel, named after their file stems.
+	
+	Returns:
+		Mapping of file path to the synced document dictionary (None on failure)
+	"""
+	client = client or get_clickup_client(api_token=api_token)
+	
+	def sync(file_path: str) -> Optional[Dict]:
+		try:
+			return sync_local_document_to_clickup(folder_id, Path(file_path).stem, file_path, client=client)
+		except Exception as e:
+			print(f"Error syncing {file_path}: {e}")
+			return None
+	
+	# One client, so every worker shares the same session pool
+	with ThreadPoolExecutor(max_workers=client.MAX_PARALLEL_REQUESTS) as pool:
+		return dict(zip(file_paths, pool.map(sync, file_paths)))
@@ -1,10 +1,13 @@
+import functools
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+@functools.lru_cache(maxsize=1)
 def get_openai_api_key() -> str:
+	# A missing key raises and is not cached, so setting it later still works
 	key = os.getenv("OPENAI_API_KEY", "").strip()
 	if not key:
 		raise RuntimeError(
@@ -16,12 +19,21 @@ def get_openai_api_key() -> str:
 	return key
 
 
+@functools.lru_cache(maxsize=1)
+def get_shared_openai_client():
+	"""Process-wide OpenAI client so all agents reuse one connection pool."""
+	from openai import OpenAI
+	return OpenAI(api_key=get_openai_api_key())
+
+
 OPENAI_EMBED_MODEL = os.getenv("OPENAI_EMBED_MODEL", "text-embedding-3-large")
 OPENAI_CHAT_MODEL = os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini")
 
 DATA_DIR = os.path.join("data")
 RAW_DIR = os.path.join(DATA_DIR, "raw")
 PROCESSED_DIR = os.path.join(DATA_DIR, "processed")
+# All chunks in one JSON-lines shard, read sequentially by the embedder
+CHUNKS_FILE = os.path.join(PROCESSED_DIR, "chunks.jsonl")
 CHROMA_DIR = os.path.join(DATA_DIR, "chroma")
 
 # Only create directories if not in serverless environment (Vercel has read-only filesystem)
@@ -1,18 +1,64 @@
+import os
 import json
+import time
 import argparse
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from src.agents.researcher import ResearcherAgent
+from src.config import OPENAI_CHAT_MODEL
+from src.prompts import RESEARCHER_SYSTEM
 
+# One file per answered question, so re-runs only pay for new or changed questions
+EVAL_CACHE_DIR = Path("data/eval_cache")
+# Cached answers older than this are re-asked, so a re-ingested index shows up without --no-cache
+EVAL_CACHE_TTL = int(os.getenv("EVAL_CACHE_TTL", "86400"))
+# A different model or researcher prompt gives different answers, so they are part of the key
+_PROMPT_HASH = hashlib.blake2b(RESEARCHER_SYSTEM.encode("utf-8"), digest_size=8).hexdigest()
 
-def run_eval(collection: str, bench_path: str, k: int = 8) -> None:
+
+def _cache_path(collection: str, k: int, q: str) -> Path:
+    key = hashlib.blake2b(
+        f"{OPENAI_CHAT_MODEL}|{_PROMPT_HASH}|{collection}|{k}|{q}".encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return EVAL_CACHE_DIR / f"{key}.json"
+
+
+def _cached_answer(path: Path, ttl: int):
+    """The cached result at path, or None if it is missing or older than ttl seconds."""
+    try:
+        if time.time() - path.stat().st_mtime > ttl:
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def run_eval(
+    collection: str, bench_path: str, k: int = 8, workers: int = 8,
+    use_cache: bool = True, cache_ttl: int = EVAL_CACHE_TTL,
+) -> None:
     agent = ResearcherAgent(collection)
     bench = json.loads(Path(bench_path).read_text(encoding="utf-8"))
-    results = []
-    for item in bench:
-        q = item["q"]
-        res = agent.research(q, k=k)
-        results.append({"q": q, "answer": res["answer"]})
+
+    def answer(item):
+        path = _cache_path(collection, k, item["q"])
+        if use_cache:
+            cached = _cached_answer(path, cache_ttl)
+            if cached is not None:
+                return cached
+        # Each question stands alone; carrying over earlier answers would make
+        # results depend on which thread finished first
+        res = agent.research(item["q"], k=k, include_context=False)
+        result = {"q": item["q"], "answer": res["answer"]}
+        EVAL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
+        return result
+
+    # Queries are independent and wait on the network, so run them side by side (in bench order)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(answer, bench))
     out_path = Path(bench_path).with_suffix(".out.json")
     out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
     print(f"Wrote {out_path}")
@@ -23,8 +69,11 @@ def main():
     p.add_argument("--collection", default="growthboss-rag")
     p.add_argument("--bench", default="src/eval/bench.json")
     p.add_argument("--k", type=int, default=8)
+    p.add_argument("--workers", type=int, default=8, help="Questions answered concurrently")
+    p.add_argument("--no-cache", action="store_true", help="Ignore cached answers (e.g. after re-ingesting)")
+    p.add_argument("--cache-ttl", type=int, default=EVAL_CACHE_TTL, help="Seconds before a cached answer is re-asked")
     args = p.parse_args()
-    run_eval(args.collection, args.bench, args.k)
+    run_eval(args.collection, args.bench, args.k, args.workers, use_cache=not args.no_cache, cache_ttl=args.cache_ttl)
 
 
 if __name__ == "__main__":
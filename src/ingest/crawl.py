@@ -1,27 +1,37 @@
+import functools
 import os
-import re
-import json
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, parse_qs
 from typing import List, Dict, Optional
 
 import trafilatura
-from bs4 import BeautifulSoup
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import yaml
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
 
-from src.config import RAW_DIR
+from src.config import DATA_DIR, RAW_DIR
+from src.ingest.utils import dumps, slugify, write_if_changed
 
+# Pages downloaded at once; crawling is network-bound, so threads overlap the waits
+CRAWL_WORKERS = 16
+# Transcripts already fetched, so re-crawls skip those videos
+TRANSCRIPT_CACHE_DIR = os.path.join(DATA_DIR, "transcripts")
 
-def _slugify(text: str) -> str:
-	text = re.sub(r"[^a-zA-Z0-9_-]+", "-", text.strip().lower())
-	return re.sub(r"-+", "-", text).strip("-")
+
+# libyaml's C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 def load_sources(path: str) -> Dict:
+	return _load_sources(path, os.stat(path).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_sources(path: str, mtime_ns: int) -> Dict:
+	# mtime_ns is part of the cache key, so an edited file is parsed again
 	with open(path, "r", encoding="utf-8") as f:
-		return yaml.safe_load(f)
+		return yaml.load(f, Loader=_YAML_LOADER)
 
 
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=8))
@@ -67,57 +77,67 @@ def fetch_youtube_transcript(video_id: str) -> Optional[str]:
 		return None
 
 
-def _extract_title(html: str) -> Optional[str]:
+def _cached_transcript(video_id: str) -> Optional[str]:
+	"""fetch_youtube_transcript, backed by a file per video in TRANSCRIPT_CACHE_DIR."""
+	path = os.path.join(TRANSCRIPT_CACHE_DIR, hashlib.sha1(video_id.encode("utf-8")).hexdigest() + ".txt")
 	try:
-		soup = BeautifulSoup(html, "html.parser")
-		title = soup.title.string if soup.title else None
-		if title:
-			return title.strip()
-	except Exception:
-		return None
-	return None
+		with open(path, "r", encoding="utf-8") as f:
+			return f.read()
+	except FileNotFoundError:
+		pass
+	text = fetch_youtube_transcript(video_id)
+	if text:
+		os.makedirs(TRANSCRIPT_CACHE_DIR, exist_ok=True)
+		with open(path, "w", encoding="utf-8") as f:
+			f.write(text)
+	return text
 
 
 def save_raw_document(source_url: str, content: str, kind: str, title: Optional[str] = None) -> str:
 	sha = hashlib.sha256(source_url.encode("utf-8")).hexdigest()[:12]
-	filename = f"{kind}-{_slugify(source_url)[:60]}-{sha}.json"
+	filename = f"{kind}-{slugify(source_url)[:60]}-{sha}.json"
 	path = os.path.join(RAW_DIR, filename)
-	with open(path, "w", encoding="utf-8") as f:
-		parsed = urlparse(source_url)
-		json.dump({
-			"url": source_url,
-			"domain": parsed.netloc,
-			"title": title,
-			"kind": kind,
-			"content": content
-		}, f, ensure_ascii=False)
+	write_if_changed(path, dumps({
+		"url": source_url,
+		"domain": urlparse(source_url).netloc,
+		"title": title,
+		"kind": kind,
+		"content": content
+	}))
 	return path
 
 
+def _crawl_web_page(url: str) -> Optional[str]:
+	"""Fetch, extract and save one page; returns the saved path, if any."""
+	try:
+		downloaded = trafilatura.fetch_url(url)
+		if not downloaded:
+			return None
+		# One parse for both the main text and the page title
+		rec = trafilatura.bare_extraction(downloaded, include_comments=False, include_tables=False, with_metadata=True)
+		if rec is not None and not isinstance(rec, dict):
+			rec = rec.as_dict()  # trafilatura 2.x returns a Document
+		text = rec.get("text") if rec else None
+		if text and len(text.strip()) > 200:
+			return save_raw_document(url, text, kind="web", title=rec.get("title"))
+	except Exception as e:
+		print(f"Failed to fetch {url}: {e}")
+	return None
+
+
 def run_crawl(sources_yaml: str) -> List[str]:
 	sources = load_sources(sources_yaml)
 	saved: List[str] = []
-	seen: set[str] = set()
 
-	for url in sources.get("web", []) or []:
-		if url in seen:
-			continue
-		seen.add(url)
-		try:
-			downloaded = trafilatura.fetch_url(url)
-			text = trafilatura.extract(downloaded, include_comments=False, include_tables=False) if downloaded else None
-			if text and len(text.strip()) > 200:
-				title = _extract_title(downloaded or "") if downloaded else None
-				path = save_raw_document(url, text, kind="web", title=title)
-				saved.append(path)
-		except Exception as e:
-			print(f"Failed to fetch {url}: {e}")
-
-	for yurl in sources.get("youtube", []) or []:
-		vid = extract_youtube_video_id(yurl)
-		if not vid:
-			continue
-		text = fetch_youtube_transcript(vid)
+	urls = list(dict.fromkeys(sources.get("web", []) or []))  # De-duplicated, in order
+	with ThreadPoolExecutor(max_workers=CRAWL_WORKERS) as pool:
+		saved.extend(path for path in pool.map(_crawl_web_page, urls) if path)
+
+	videos = [(yurl, vid) for yurl in sources.get("youtube", []) or [] if (vid := extract_youtube_video_id(yurl))]
+	# Transcript fetches are blocking HTTP calls; run them side by side
+	with ThreadPoolExecutor(max_workers=CRAWL_WORKERS) as pool:
+		texts = list(pool.map(_cached_transcript, [vid for _, vid in videos]))
+	for (yurl, _), text in zip(videos, texts):
 		if text and len(text.strip()) > 100:
 			path = save_raw_document(yurl, text, kind="youtube", title=None)
 			saved.append(path)
@@ -1,50 +1,141 @@
 import os
-import json
-from typing import List, Dict
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Dict, Tuple
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-from src.config import RAW_DIR, PROCESSED_DIR
+from src.config import RAW_DIR, PROCESSED_DIR, CHUNKS_FILE
+from src.ingest.utils import dumps as _dumps, loads as _loads
 
+# Content hash and chunk count of each raw document already in CHUNKS_FILE, to skip re-chunking it
+MANIFEST_FILE = os.path.join(PROCESSED_DIR, ".manifest.json")
 
-def _iter_raw() -> List[str]:
-	return [os.path.join(RAW_DIR, f) for f in os.listdir(RAW_DIR) if f.endswith(".json")]
+# Below this many documents to split, starting a process pool costs more than it saves
+_POOL_MIN_DOCS = 8
+
+
+def _iter_raw() -> Iterator[str]:
+	return (e.path for e in os.scandir(RAW_DIR) if e.name.endswith(".json"))
 
 
 def _load_raw(path: str) -> Dict:
-	with open(path, "r", encoding="utf-8") as f:
-		return json.load(f)
+	with open(path, "rb") as f:
+		return _loads(f.read())
+
+
+# Built once per process so pool workers reuse its compiled separators
+_SPLITTER = RecursiveCharacterTextSplitter(
+	chunk_size=1200,
+	chunk_overlap=200,
+	length_function=len,
+	separators=["\n\n", "\n", ". ", " ", ""],
+)
+
+
+def _chunk_one(raw_path: str) -> List[Tuple[str, Dict]]:
+	"""Load and split one raw document into (text, metadata) chunks; no disk writes."""
+	payload = _load_raw(raw_path)
+	content = payload.get("content", "")
+	if not content:
+		return []
+	return [
+		(chunk, {
+			"source": payload.get("url"),
+			"domain": payload.get("domain"),
+			"title": payload.get("title"),
+			"kind": payload.get("kind"),
+			"chunk_index": idx,
+		})
+		for idx, chunk in enumerate(_SPLITTER.split_text(content))
+	]
+
+
+def _stem(raw_path: str) -> str:
+	return os.path.basename(raw_path)[:-len(".json")]
+
+
+def _file_sha256(path: str) -> str:
+	with open(path, "rb") as f:
+		return hashlib.sha256(f.read()).hexdigest()
+
+
+def _load_manifest() -> Dict[str, Dict]:
+	"""Raw document stem -> {"sha256", "chunks"}, as of the last chunk_and_save."""
+	if not os.path.exists(CHUNKS_FILE):
+		# Without the shard there is nothing to reuse, whatever the manifest says
+		return {}
+	try:
+		with open(MANIFEST_FILE, "rb") as f:
+			return _loads(f.read())
+	except (FileNotFoundError, ValueError):
+		return {}
+
+
+def _load_previous_chunks() -> Dict[str, List[Tuple[str, bytes]]]:
+	"""Already-encoded (id, line) pairs from the last shard, grouped by raw document stem."""
+	previous: Dict[str, List[Tuple[str, bytes]]] = {}
+	try:
+		with open(CHUNKS_FILE, "rb") as f:
+			for line in f:
+				if line.strip():
+					chunk_id = _loads(line)["id"]
+					previous.setdefault(chunk_id.rsplit("-c", 1)[0], []).append((chunk_id, line))
+	except FileNotFoundError:
+		pass
+	return previous
 
 
 def chunk_and_save() -> List[str]:
-	text_splitter = RecursiveCharacterTextSplitter(
-		chunk_size=1200,
-		chunk_overlap=200,
-		length_function=len,
-		separators=["\n\n", "\n", ". ", " ", ""],
-	)
+	"""Split every raw document and write all chunks to CHUNKS_FILE; returns the chunk ids.
 
-	saved: List[str] = []
-	for raw_path in _iter_raw():
-		payload = _load_raw(raw_path)
-		content = payload.get("content", "")
-		if not content:
-			continue
-		chunks = text_splitter.split_text(content)
-		for idx, chunk in enumerate(chunks):
-			meta = {
-				"source": payload.get("url"),
-				"domain": payload.get("domain"),
-				"title": payload.get("title"),
-				"kind": payload.get("kind"),
-				"chunk_index": idx,
-			}
-			fname = os.path.basename(raw_path).replace(".json", f"-c{idx:04d}.json")
-			out_path = os.path.join(PROCESSED_DIR, fname)
-			with open(out_path, "w", encoding="utf-8") as f:
-				json.dump({"text": chunk, "metadata": meta}, f, ensure_ascii=False)
-			saved.append(out_path)
+	Documents whose content hash and chunk count match the manifest keep their chunks from the last run.
+	"""
+	raw_paths = list(_iter_raw())
+	hashes = {_stem(p): _file_sha256(p) for p in raw_paths}
+	manifest = _load_manifest()
+	previous = _load_previous_chunks() if manifest else {}
 
-	return saved
+	def unchanged(stem: str) -> bool:
+		# The chunk count catches a shard that lost lines since the manifest was written
+		entry = manifest.get(stem)
+		return (
+			isinstance(entry, dict)
+			and entry.get("sha256") == hashes[stem]
+			and entry.get("chunks") == len(previous.get(stem, ()))
+		)
+
+	todo = [p for p in raw_paths if not unchanged(_stem(p))]
 
+	# Splitting is CPU-bound and independent per document, so spread it across cores
+	# when there is enough of it; writes stay in this process
+	if len(todo) < _POOL_MIN_DOCS:
+		fresh = {p: _chunk_one(p) for p in todo}
+	else:
+		with ProcessPoolExecutor() as pool:
+			fresh = dict(zip(todo, pool.map(_chunk_one, todo, chunksize=8)))
 
+	saved: List[str] = []
+	counts: Dict[str, int] = {}
+	tmp_file = CHUNKS_FILE + ".tmp"
+	with open(tmp_file, "wb") as out:
+		for raw_path in raw_paths:
+			stem = _stem(raw_path)
+			if raw_path in fresh:
+				lines = []
+				for chunk, meta in fresh[raw_path]:
+					chunk_id = f"{stem}-c{meta['chunk_index']:04d}"
+					lines.append(_dumps({"id": chunk_id, "text": chunk, "metadata": meta}) + b"\n")
+					saved.append(chunk_id)
+			else:
+				# A document that produced no chunks has no entry in the previous shard
+				kept = previous.get(stem, [])
+				lines = [line for _, line in kept]
+				saved.extend(chunk_id for chunk_id, _ in kept)
+			counts[stem] = len(lines)
+			out.write(b"".join(lines))
+	os.replace(tmp_file, CHUNKS_FILE)
+	with open(MANIFEST_FILE, "wb") as f:
+		f.write(_dumps({stem: {"sha256": digest, "chunks": counts[stem]} for stem, digest in hashes.items()}))
+
+	return saved
@@ -1,37 +1,29 @@
 """Ingest local markdown files and documents into the RAG system."""
 
 import os
-import json
 import hashlib
 from pathlib import Path
 from typing import List, Dict
 from urllib.parse import urlparse
 
 from src.config import RAW_DIR
-
-
-def _slugify(text: str) -> str:
-	"""Convert text to filename-safe slug."""
-	import re
-	text = re.sub(r"[^a-zA-Z0-9_-]+", "-", text.strip().lower())
-	return re.sub(r"-+", "-", text).strip("-")
+from src.ingest.utils import dumps, slugify, write_if_changed
 
 
 def save_local_document(file_path: str, content: str, title: str = None) -> str:
 	"""Save a local file as a raw document for ingestion."""
 	file_path_obj = Path(file_path)
 	sha = hashlib.sha256(file_path.encode("utf-8")).hexdigest()[:12]
-	filename = f"local-{_slugify(file_path_obj.stem)}-{sha}.json"
+	filename = f"local-{slugify(file_path_obj.stem)}-{sha}.json"
 	path = os.path.join(RAW_DIR, filename)
 	
-	with open(path, "w", encoding="utf-8") as f:
-		json.dump({
-			"url": f"file://{file_path}",
-			"domain": "local",
-			"title": title or file_path_obj.stem.replace("_", " ").title(),
-			"kind": "local",
-			"content": content
-		}, f, ensure_ascii=False)
+	write_if_changed(path, dumps({
+		"url": f"file://{file_path}",
+		"domain": "local",
+		"title": title or file_path_obj.stem.replace("_", " ").title(),
+		"kind": "local",
+		"content": content
+	}))
 	
 	return path
 
@@ -57,8 +49,8 @@ def ingest_local_files(file_paths: List[str]) -> List[str]:
 			# Extract title from first heading if markdown
 			title = None
 			if path_obj.suffix == ".md":
-				lines = content.split("\n")
-				for line in lines[:10]:
+				# Only the first 10 lines are scanned, so don't split the rest of the file
+				for line in content.split("\n", 10)[:10]:
 					if line.startswith("# "):
 						title = line[2:].strip()
 						break
@@ -0,0 +1,40 @@
+"""Helpers shared by the ingest modules."""
+
+import json
+import os
+import re
+
+try:
+	import orjson
+	
+	dumps = orjson.dumps
+	loads = orjson.loads
+except ImportError:  # Fall back to the stdlib encoder
+	def dumps(obj) -> bytes:
+		return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+	
+	loads = json.loads
+
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9_-]+")
+_DASH_RE = re.compile(r"-+")
+
+
+def slugify(text: str) -> str:
+	"""Convert text to filename-safe slug."""
+	return _DASH_RE.sub("-", _SLUG_RE.sub("-", text.strip().lower())).strip("-")
+
+
+def write_if_changed(path: str, data: bytes) -> bool:
+	"""Atomically replace path with data unless it already holds exactly those bytes."""
+	try:
+		with open(path, "rb") as f:
+			if f.read() == data:
+				return False
+	except FileNotFoundError:
+		pass
+	# Write beside the target and rename, so readers never see a half-written file
+	tmp_path = f"{path}.tmp"
+	with open(tmp_path, "wb") as f:
+		f.write(data)
+	os.replace(tmp_path, path)
+	return True
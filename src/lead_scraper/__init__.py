@@ -3,9 +3,7 @@ Lead Scraper - HubSpot and Apollo Integration
 Comprehensive lead scraping from HubSpot and Apollo APIs.
 """
 
-from .hubspot_integration import HubSpotIntegration
-from .apollo_integration import ApolloIntegration
-from .scraper import LeadScraper
+import importlib
 
 __all__ = [
     "HubSpotIntegration",
@@ -13,6 +11,20 @@ __all__ = [
     "LeadScraper",
 ]
 
+# Submodule defining each export; loaded on first access so importing the
+# package (e.g. to run its CLI) doesn't pull in requests and both integrations
+_EXPORT_MODULES = {
+    "HubSpotIntegration": ".hubspot_integration",
+    "ApolloIntegration": ".apollo_integration",
+    "LeadScraper": ".scraper",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORT_MODULES:
+        return getattr(importlib.import_module(_EXPORT_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 
 
@@ -3,24 +3,110 @@ Apollo Integration - Lead Discovery and Enrichment
 Comprehensive integration for searching and fetching leads from Apollo.io.
 """
 
+import functools
+import hashlib
+import json
 import os
-import requests
+import threading
 import time
-from typing import List, Dict, Optional, Any
+import requests
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # Fall back to the stdlib decoder
+    _loads = json.loads
+from typing import Deque, Iterator, List, Dict, Optional, Any
 from datetime import datetime
 
+# (normalized key, Apollo key) pairs copied as-is, defaulting to ""
+_PERSON_FIELDS = (
+    ("email", "email"),
+    ("first_name", "first_name"),
+    ("last_name", "last_name"),
+    ("full_name", "name"),
+    ("job_title", "title"),
+    ("linkedin_url", "linkedin_url"),
+    ("twitter_url", "twitter_url"),
+    ("city", "city"),
+    ("state", "state"),
+    ("country", "country"),
+    ("department", "department"),
+    ("seniority", "seniority"),
+    ("created_at", "created_at"),
+    ("updated_at", "updated_at"),
+)
+_PERSON_ORGANIZATION_FIELDS = (
+    ("company", "name"),
+    ("website", "website_url"),
+)
+_ORGANIZATION_FIELDS = (
+    ("name", "name"),
+    ("domain", "website_url"),
+    ("website", "website_url"),
+    ("industry", "industry"),
+    ("employee_count", "estimated_num_employees"),
+    ("city", "city"),
+    ("state", "state"),
+    ("country", "country"),
+    ("linkedin_url", "linkedin_url"),
+    ("twitter_url", "twitter_url"),
+    ("created_at", "created_at"),
+)
+
+
+class _TokenBucket:
+    """Thread-safe token bucket: acquire() blocks until a request may be sent."""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
 
 class ApolloIntegration:
     """Comprehensive Apollo.io API integration for lead discovery."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Pages iter_people fetches ahead once it knows the page count
+    MAX_CONCURRENT_PAGES = 8
+    # Seconds (and entries) a cached search/enrich response is kept
+    RESPONSE_CACHE_TTL = 300
+    MAX_CACHED_RESPONSES = 1024
+    # Client-side pacing shared by all threads using this client; short bursts up
+    # to RATE_LIMIT_BURST, then RATE_LIMIT_PER_SECOND on average
+    RATE_LIMIT_PER_SECOND = 5.0
+    RATE_LIMIT_BURST = 10
+    # Apollo's bulk match takes at most this many people per call
+    BULK_MATCH_SIZE = 10
+    MAX_CONCURRENT_BULK_MATCHES = 5
+    
+    def __init__(self, api_key: Optional[str] = None, keep_raw: bool = False):
         """
         Initialize Apollo integration.
         
         Args:
             api_key: Apollo API key (defaults to APOLLO_API_KEY env var)
+            keep_raw: Keep the original Apollo record under "raw_data" in normalized results
         """
         self.api_key = api_key or os.getenv("APOLLO_API_KEY")
+        self.keep_raw = keep_raw
         self.base_url = "https://api.apollo.io/v1"
         
         if not self.api_key:
@@ -34,15 +120,85 @@ class ApolloIntegration:
             "Content-Type": "application/json",
             "X-Api-Key": self.api_key
         }
+        
+        # One pooled session so calls reuse keep-alive connections; rate-limited
+        # (429) and transient 5xx responses are retried with backoff, waiting for
+        # Retry-After when Apollo sends it
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "POST"],
+            raise_on_status=False
+        )
+        self._session.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=retry))
+        
+        # Responses of read-only requests (see _make_request's use_cache), oldest first
+        self._responses: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._cache_lock = threading.Lock()
+        self._bucket = _TokenBucket(self.RATE_LIMIT_PER_SECOND, self.RATE_LIMIT_BURST)
+    
+    def close(self):
+        """Close pooled connections."""
+        self._session.close()
     
     def _make_request(
         self, 
         method: str, 
         endpoint: str, 
         data: Optional[Dict] = None, 
-        params: Optional[Dict] = None
+        params: Optional[Dict] = None,
+        use_cache: bool = False
     ) -> Dict:
-        """Make API request to Apollo."""
+        """
+        Make API request to Apollo.
+        
+        With use_cache (read-only endpoints), identical requests share one response:
+        concurrent callers wait for the request already in flight, and later callers
+        reuse it for RESPONSE_CACHE_TTL seconds.
+        """
+        if not use_cache:
+            return self._send(method, endpoint, data, params)
+        
+        key = hashlib.blake2b(
+            json.dumps([method.upper(), endpoint, data, params], sort_keys=True, default=str).encode("utf-8"),
+            digest_size=16
+        ).hexdigest()
+        with self._cache_lock:
+            cached = self._responses.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._responses.move_to_end(key)
+                return cached[1]
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._inflight[key] = Future()
+        
+        if not is_owner:
+            return future.result()
+        
+        try:
+            response = self._send(method, endpoint, data, params)
+        except Exception as e:
+            with self._cache_lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        
+        with self._cache_lock:
+            del self._inflight[key]
+            self._responses[key] = (time.monotonic() + self.RESPONSE_CACHE_TTL, response)
+            self._responses.move_to_end(key)
+            if len(self._responses) > self.MAX_CACHED_RESPONSES:
+                self._responses.popitem(last=False)
+        future.set_result(response)
+        return response
+    
+    def _send(self, method: str, endpoint: str, data: Optional[Dict], params: Optional[Dict]) -> Dict:
+        """Send one request to Apollo and decode the JSON response."""
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         
         # Apollo uses API key in header (X-Api-Key) - already set in headers
@@ -50,16 +206,16 @@ class ApolloIntegration:
         if params is None:
             params = {}
         
+        self._bucket.acquire()
         try:
             if method.upper() == "GET":
-                response = requests.get(url, headers=self.headers, params=params, timeout=30)
+                response = self._session.get(url, params=params, timeout=30)
             elif method.upper() == "POST":
-                response = requests.post(url, headers=self.headers, json=data, params=params, timeout=30)
+                response = self._session.post(url, json=data, params=params, timeout=30)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
             response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
             error_msg = f"Apollo API error: {e}"
             if hasattr(e, 'response') and e.response is not None:
@@ -67,7 +223,14 @@ class ApolloIntegration:
                     error_msg += f" - Response: {e.response.text}"
                 except:
                     pass
-            raise Exception(error_msg)
+            # Chained so callers can still read the HTTP status off e.__cause__
+            raise Exception(error_msg) from e
+        
+        # Parse the raw bytes directly (search pages can hold 100 full person records)
+        try:
+            return _loads(response.content)
+        except ValueError as e:
+            raise Exception(f"Apollo API error: invalid JSON response - {e}")
     
     def search_people(
         self,
@@ -127,12 +290,9 @@ class ApolloIntegration:
             data["q_organization_keyword_tags"] = q_organization_keyword_tags
         
         try:
-            response = self._make_request("POST", "/mixed_people/search", data=data)
+            response = self._make_request("POST", "/mixed_people/search", data=data, use_cache=True)
             
-            people = []
-            for person in response.get("people", []):
-                person_data = self._normalize_person(person)
-                people.append(person_data)
+            people = [self._normalize_person(person) for person in response.get("people", [])]
             
             pagination = response.get("pagination", {})
             return {
@@ -156,31 +316,17 @@ class ApolloIntegration:
     
     def _normalize_person(self, person: Dict) -> Dict:
         """Normalize Apollo person data to standard format."""
-        organization = person.get("organization", {})
-        
-        return {
-            "id": person.get("id"),
-            "source": "apollo",
-            "email": person.get("email", ""),
-            "first_name": person.get("first_name", ""),
-            "last_name": person.get("last_name", ""),
-            "full_name": person.get("name", ""),
-            "phone": person.get("phone_numbers", [{}])[0].get("raw_number", "") if person.get("phone_numbers") else "",
-            "company": organization.get("name", ""),
-            "company_id": organization.get("id"),
-            "job_title": person.get("title", ""),
-            "website": organization.get("website_url", ""),
-            "linkedin_url": person.get("linkedin_url", ""),
-            "twitter_url": person.get("twitter_url", ""),
-            "city": person.get("city", ""),
-            "state": person.get("state", ""),
-            "country": person.get("country", ""),
-            "department": person.get("department", ""),
-            "seniority": person.get("seniority", ""),
-            "created_at": person.get("created_at", ""),
-            "updated_at": person.get("updated_at", ""),
-            "raw_data": person
-        }
+        organization = person.get("organization") or {}
+        phone_numbers = person.get("phone_numbers")
+        
+        normalized = {"id": person.get("id"), "source": "apollo"}
+        normalized.update({key: person.get(field, "") for key, field in _PERSON_FIELDS})
+        normalized.update({key: organization.get(field, "") for key, field in _PERSON_ORGANIZATION_FIELDS})
+        normalized["company_id"] = organization.get("id")
+        normalized["phone"] = phone_numbers[0].get("raw_number", "") if phone_numbers else ""
+        if self.keep_raw:
+            normalized["raw_data"] = person
+        return normalized
     
     def search_organizations(
         self,
@@ -228,12 +374,9 @@ class ApolloIntegration:
             data["organization_locations"] = locations
         
         try:
-            response = self._make_request("POST", "/organizations/search", data=data)
+            response = self._make_request("POST", "/organizations/search", data=data, use_cache=True)
             
-            organizations = []
-            for org in response.get("organizations", []):
-                org_data = self._normalize_organization(org)
-                organizations.append(org_data)
+            organizations = [self._normalize_organization(org) for org in response.get("organizations", [])]
             
             pagination = response.get("pagination", {})
             return {
@@ -257,22 +400,70 @@ class ApolloIntegration:
     
     def _normalize_organization(self, organization: Dict) -> Dict:
         """Normalize Apollo organization data to standard format."""
-        return {
-            "id": organization.get("id"),
-            "source": "apollo",
-            "name": organization.get("name", ""),
-            "domain": organization.get("website_url", ""),
-            "website": organization.get("website_url", ""),
-            "industry": organization.get("industry", ""),
-            "employee_count": organization.get("estimated_num_employees", ""),
-            "city": organization.get("city", ""),
-            "state": organization.get("state", ""),
-            "country": organization.get("country", ""),
-            "linkedin_url": organization.get("linkedin_url", ""),
-            "twitter_url": organization.get("twitter_url", ""),
-            "created_at": organization.get("created_at", ""),
-            "raw_data": organization
-        }
+        normalized = {"id": organization.get("id"), "source": "apollo"}
+        normalized.update({key: organization.get(field, "") for key, field in _ORGANIZATION_FIELDS})
+        if self.keep_raw:
+            normalized["raw_data"] = organization
+        return normalized
+    
+    def iter_people(
+        self,
+        person_titles: Optional[List[str]] = None,
+        person_locations: Optional[List[str]] = None,
+        person_seniorities: Optional[List[str]] = None,
+        person_departments: Optional[List[str]] = None,
+        q_keywords: Optional[str] = None,
+        q_organization_name: Optional[str] = None,
+        limit: Optional[int] = None,
+        per_page: int = 25
+    ) -> Iterator[Dict]:
+        """
+        Yield matching people in page order, fetching a window of pages ahead.
+        
+        Takes the same arguments as get_all_people. At most MAX_CONCURRENT_PAGES
+        pages are in flight or held in memory at once, and no further pages are
+        requested once limit people have been yielded.
+        """
+        per_page = min(per_page, 100)
+        search = functools.partial(
+            self.search_people,
+            person_titles=person_titles,
+            person_locations=person_locations,
+            person_seniorities=person_seniorities,
+            person_departments=person_departments,
+            q_keywords=q_keywords,
+            q_organization_name=q_organization_name,
+            per_page=per_page
+        )
+        
+        # The first page tells us how many pages there are
+        result = search(page=1)
+        last_page = result.get("total_pages", 1) if result.get("has_more") else 1
+        if limit:
+            last_page = min(last_page, -(-limit // per_page))
+        
+        pool = ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_PAGES)
+        pending: Deque[Future] = deque()
+        next_page = 2
+        count = 0
+        try:
+            while True:
+                # Keep the window full so pages download while earlier ones are consumed
+                while next_page <= last_page and len(pending) < self.MAX_CONCURRENT_PAGES:
+                    pending.append(pool.submit(search, page=next_page))
+                    next_page += 1
+                
+                for person in result.get("people", []):
+                    yield person
+                    count += 1
+                    if limit and count >= limit:
+                        return
+                
+                if not pending:
+                    return
+                result = pending.popleft().result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
     
     def get_all_people(
         self,
@@ -301,35 +492,16 @@ class ApolloIntegration:
         Returns:
             List of all matching people
         """
-        all_people = []
-        page = 1
-        
-        while True:
-            if limit and len(all_people) >= limit:
-                break
-            
-            result = self.search_people(
-                person_titles=person_titles,
-                person_locations=person_locations,
-                person_seniorities=person_seniorities,
-                person_departments=person_departments,
-                q_keywords=q_keywords,
-                q_organization_name=q_organization_name,
-                page=page,
-                per_page=min(per_page, 100)
-            )
-            
-            people = result.get("people", [])
-            all_people.extend(people)
-            
-            if not result.get("has_more") or (limit and len(all_people) >= limit):
-                break
-            
-            page += 1
-            # Rate limiting - Apollo recommends spacing out requests
-            time.sleep(0.5)
-        
-        return all_people[:limit] if limit else all_people
+        return list(self.iter_people(
+            person_titles=person_titles,
+            person_locations=person_locations,
+            person_seniorities=person_seniorities,
+            person_departments=person_departments,
+            q_keywords=q_keywords,
+            q_organization_name=q_organization_name,
+            limit=limit,
+            per_page=per_page
+        ))
     
     def enrich_person(self, email: Optional[str] = None, person_id: Optional[str] = None) -> Optional[Dict]:
         """
@@ -352,7 +524,7 @@ class ApolloIntegration:
             params["person_id"] = person_id
         
         try:
-            response = self._make_request("GET", "/people/match", params=params)
+            response = self._make_request("GET", "/people/match", params=params, use_cache=True)
             person = response.get("person")
             if person:
                 return self._normalize_person(person)
@@ -360,4 +532,42 @@ class ApolloIntegration:
         except Exception as e:
             print(f"Error enriching person: {e}")
             return None
-
+    
+    def enrich_people_bulk(self, items: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Enrich several people at once via Apollo's bulk match endpoint.
+        
+        Args:
+            items: Dicts with an "email" and/or "person_id" key (as for enrich_person)
+        
+        Returns:
+            Enriched person data (or None) for each item, in order
+        """
+        if any(not item.get("email") and not item.get("person_id") for item in items):
+            raise ValueError("Either email or person_id must be provided for every item")
+        
+        def match(chunk: List[Dict]) -> List[Optional[Dict]]:
+            details = [
+                {key: value for key, value in (("email", item.get("email")), ("id", item.get("person_id"))) if value}
+                for item in chunk
+            ]
+            try:
+                response = self._make_request("POST", "/people/bulk_match", data={"details": details})
+            except Exception as e:
+                # Only a rejected request is worth retrying per person; rate limits,
+                # server errors and timeouts would just fail again, ten times over
+                cause = getattr(e.__cause__, "response", None)
+                status = cause.status_code if cause is not None else None
+                if status is None or not 400 <= status < 500 or status == 429:
+                    raise
+                print(f"Bulk match failed, enriching one by one: {e}")
+                return [self.enrich_person(email=item.get("email"), person_id=item.get("person_id")) for item in chunk]
+            matches = (response.get("matches") or [])[:len(chunk)]
+            matches += [None] * (len(chunk) - len(matches))
+            return [self._normalize_person(person) if person else None for person in matches]
+        
+        chunks = [items[i:i + self.BULK_MATCH_SIZE] for i in range(0, len(items), self.BULK_MATCH_SIZE)]
+        if len(chunks) <= 1:
+            return [person for chunk in chunks for person in match(chunk)]
+        with ThreadPoolExecutor(max_workers=min(self.MAX_CONCURRENT_BULK_MATCHES, len(chunks))) as pool:
+            return [person for matched in pool.map(match, chunks) for person in matched]
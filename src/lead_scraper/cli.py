@@ -7,7 +7,6 @@ import argparse
 import json
 import sys
 from typing import Optional
-from .scraper import LeadScraper
 
 
 def main():
@@ -153,6 +152,12 @@ Examples:
         help="Filter by company keywords in results"
     )
     
+    parser.add_argument(
+        "--keep-raw",
+        action="store_true",
+        help="Keep the original Apollo records under raw_data (larger output)"
+    )
+    
     # Display options
     parser.add_argument(
         "--summary",
@@ -168,9 +173,12 @@ Examples:
     
     args = parser.parse_args()
     
+    # Imported after parsing so --help and argument errors skip loading requests and the integrations
+    from .scraper import LeadScraper
+    
     try:
         # Initialize scraper
-        scraper = LeadScraper()
+        scraper = LeadScraper(keep_raw=args.keep_raw)
         
         # Determine sources
         sources = []
@@ -3,14 +3,25 @@ Unified Lead Scraper - Combines HubSpot and Apollo
 Main interface for scraping leads from multiple sources.
 """
 
+import functools
 import os
 import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Any, Set
 from datetime import datetime
 from .hubspot_integration import HubSpotIntegration
 from .apollo_integration import ApolloIntegration
 
 
+def _keyword_pattern(keywords: Optional[List[str]]) -> Optional["re.Pattern"]:
+    """Case-insensitive pattern matching any of the keywords as a substring."""
+    if not keywords:
+        return None
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+
 class LeadScraper:
     """
     Unified lead scraper that combines HubSpot and Apollo integrations.
@@ -20,7 +31,8 @@ class LeadScraper:
     def __init__(
         self,
         hubspot_api_key: Optional[str] = None,
-        apollo_api_key: Optional[str] = None
+        apollo_api_key: Optional[str] = None,
+        keep_raw: bool = False
     ):
         """
         Initialize the lead scraper with HubSpot and Apollo integrations.
@@ -28,6 +40,7 @@ class LeadScraper:
         Args:
             hubspot_api_key: HubSpot API key (defaults to HUBSPOT_API_KEY env var)
             apollo_api_key: Apollo API key (defaults to APOLLO_API_KEY env var)
+            keep_raw: Keep the original Apollo records under "raw_data"
         """
         self.hubspot = None
         self.apollo = None
@@ -38,7 +51,7 @@ class LeadScraper:
             print(f"Warning: HubSpot integration not available: {e}")
         
         try:
-            self.apollo = ApolloIntegration(api_key=apollo_api_key)
+            self.apollo = ApolloIntegration(api_key=apollo_api_key, keep_raw=keep_raw)
         except ValueError as e:
             print(f"Warning: Apollo integration not available: {e}")
         
@@ -146,21 +159,22 @@ class LeadScraper:
         """
         all_leads = []
         sources = sources or []
+        jobs = {}
         
         if not sources or "hubspot" in sources:
             if self.hubspot:
-                hubspot_leads = self.scrape_hubspot_leads(
+                jobs["HubSpot"] = functools.partial(
+                    self.scrape_hubspot_leads,
                     limit=limit_per_source or hubspot_filters.get("limit") if hubspot_filters else None,
                     job_title=hubspot_filters.get("job_title") if hubspot_filters else None,
                     company=hubspot_filters.get("company") if hubspot_filters else None,
                     industry=hubspot_filters.get("industry") if hubspot_filters else None
                 )
-                all_leads.extend(hubspot_leads)
-                print(f"Scraped {len(hubspot_leads)} leads from HubSpot")
         
         if not sources or "apollo" in sources:
             if self.apollo:
-                apollo_leads = self.scrape_apollo_leads(
+                jobs["Apollo"] = functools.partial(
+                    self.scrape_apollo_leads,
                     job_titles=apollo_filters.get("job_titles") if apollo_filters else None,
                     locations=apollo_filters.get("locations") if apollo_filters else None,
                     seniorities=apollo_filters.get("seniorities") if apollo_filters else None,
@@ -169,8 +183,18 @@ class LeadScraper:
                     keywords=apollo_filters.get("keywords") if apollo_filters else None,
                     limit=limit_per_source or apollo_filters.get("limit") if apollo_filters else None
                 )
-                all_leads.extend(apollo_leads)
-                print(f"Scraped {len(apollo_leads)} leads from Apollo")
+        
+        def timed(job):
+            start = time.perf_counter()
+            leads = job()
+            return leads, time.perf_counter() - start
+        
+        # The sources are independent network-bound scrapes, so run them side by side;
+        # results are still combined in source order (HubSpot first) for deduplication
+        with ThreadPoolExecutor(max_workers=max(len(jobs), 1)) as pool:
+            for name, (leads, elapsed) in zip(jobs, pool.map(timed, jobs.values())):
+                all_leads.extend(leads)
+                print(f"Scraped {len(leads)} leads from {name} in {elapsed:.1f}s")
         
         # Deduplicate leads
         deduplicated_leads = self.deduplicate_leads(all_leads)
@@ -333,6 +357,9 @@ class LeadScraper:
         Returns:
             Filtered list of leads
         """
+        # One alternation per keyword list, compiled once instead of scanning every keyword per lead
+        job_title_pattern = _keyword_pattern(job_title_keywords)
+        company_pattern = _keyword_pattern(company_keywords)
         filtered = []
         
         for lead in leads:
@@ -345,15 +372,11 @@ class LeadScraper:
             if has_company and not lead.get("company"):
                 continue
             
-            if job_title_keywords:
-                job_title = lead.get("job_title", "").lower()
-                if not any(keyword.lower() in job_title for keyword in job_title_keywords):
-                    continue
+            if job_title_pattern and not job_title_pattern.search(lead.get("job_title") or ""):
+                continue
             
-            if company_keywords:
-                company = lead.get("company", "").lower()
-                if not any(keyword.lower() in company for keyword in company_keywords):
-                    continue
+            if company_pattern and not company_pattern.search(lead.get("company") or ""):
+                continue
             
             filtered.append(lead)
         
@@ -5,6 +5,8 @@ Conversation memory and session management.
 
 import json
 import os
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -21,6 +23,8 @@ class ConversationMemory:
 		self.memory_file = MEMORY_DIR / f"{self.session_id}.json"
 		self.conversations: List[Dict] = []
 		self.user_profile: Dict = {}
+		# Serialises appends and file writes when one memory is shared across threads
+		self._lock = threading.Lock()
 		self._load()
 	
 	def _load(self):
@@ -56,8 +60,9 @@ class ConversationMemory:
 			'answer': answer,
 			'metadata': metadata or {},
 		}
-		self.conversations.append(exchange)
-		self._save()
+		with self._lock:
+			self.conversations.append(exchange)
+			self._save()
 	
 	def get_context(self, max_exchanges: int = 5) -> str:
 		"""Get recent conversation context."""
@@ -120,7 +125,27 @@ class ConversationMemory:
 		}
 
 
+# Process-local LRU of loaded sessions so a warm process doesn't re-read
+# the session file from disk on every exchange
+_MAX_CACHED_SESSIONS = 256
+_sessions: "OrderedDict[str, ConversationMemory]" = OrderedDict()
+_sessions_lock = threading.Lock()
+
+
 def get_memory(session_id: Optional[str] = None) -> ConversationMemory:
 	"""Get or create conversation memory for a session."""
-	return ConversationMemory(session_id=session_id)
+	if session_id is None:
+		return ConversationMemory()
+	
+	with _sessions_lock:
+		memory = _sessions.get(session_id)
+		if memory is not None:
+			_sessions.move_to_end(session_id)
+			return memory
+		
+		memory = ConversationMemory(session_id=session_id)
+		_sessions[session_id] = memory
+		if len(_sessions) > _MAX_CACHED_SESSIONS:
+			_sessions.popitem(last=False)
+		return memory
 
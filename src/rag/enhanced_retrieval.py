@@ -5,9 +5,8 @@ Enhanced retrieval system with hybrid search, re-ranking, and query expansion.
 
 import re
 from typing import List, Dict, Optional
-from openai import OpenAI
 
-from src.config import get_openai_api_key, OPENAI_CHAT_MODEL
+from src.config import get_shared_openai_client, OPENAI_CHAT_MODEL
 from src.rag.vectorstore import query as basic_query
 
 
@@ -16,7 +15,7 @@ class EnhancedRetrieval:
 	
 	def __init__(self, collection_name: str):
 		self.collection_name = collection_name
-		self.client = OpenAI(api_key=get_openai_api_key())
+		self.client = get_shared_openai_client()
 	
 	def expand_query(self, query: str) -> List[str]:
 		"""Generate multiple query variations for better retrieval."""
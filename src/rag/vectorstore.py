@@ -1,21 +1,27 @@
-import os
 import json
-from typing import List, Dict, Tuple
+from types import MappingProxyType
+from typing import Iterator, List, Dict, Optional, Tuple
 
 import chromadb
 from chromadb.config import Settings
-from openai import OpenAI
 
-from src.config import CHROMA_DIR, PROCESSED_DIR, get_openai_api_key, OPENAI_EMBED_MODEL
+from src.config import CHROMA_DIR, CHUNKS_FILE, get_shared_openai_client, OPENAI_EMBED_MODEL
 
+try:
+	from orjson import loads as _loads
+except ImportError:  # Fall back to the stdlib decoder
+	_loads = json.loads
 
-def _iter_processed() -> List[str]:
-	return [os.path.join(PROCESSED_DIR, f) for f in os.listdir(PROCESSED_DIR) if f.endswith(".json")]
+# Shared read-only stand-in for chunks stored without metadata
+EMPTY_METADATA = MappingProxyType({})
 
 
-def _load_json(path: str) -> Dict:
-	with open(path, "r", encoding="utf-8") as f:
-		return json.load(f)
+def _iter_processed() -> Iterator[Dict]:
+	"""Chunk records from the JSON-lines shard written by chunk_and_save."""
+	with open(CHUNKS_FILE, "rb") as f:
+		for line in f:
+			if line.strip():
+				yield _loads(line)
 
 
 def _get_or_create_collection(client: chromadb.Client, name: str):
@@ -34,20 +40,19 @@ def build_vectorstore(collection_name: str = "growthboss-rag") -> Tuple[chromadb
 		# Collection doesn't exist, create it
 		collection = _get_or_create_collection(client, collection_name)
 
-	client_oai = OpenAI(api_key=get_openai_api_key())
+	client_oai = get_shared_openai_client()
 	texts: List[str] = []
 	metadatas: List[Dict] = []
 	ids: List[str] = []
 
-	for path in _iter_processed():
-		payload = _load_json(path)
+	for payload in _iter_processed():
 		text = payload.get("text", "").strip()
 		meta = payload.get("metadata", {})
 		if not text:
 			continue
 		texts.append(text)
 		metadatas.append(meta)
-		ids.append(os.path.basename(path))
+		ids.append(payload["id"])
 
 	# Embed in batches to avoid token/size limits
 	batch_size = 64
@@ -60,16 +65,17 @@ def build_vectorstore(collection_name: str = "growthboss-rag") -> Tuple[chromadb
 	return client, collection.name
 
 
-def query(collection_name: str, query_text: str, k: int = 8, per_domain: int = 3) -> List[Dict]:
+def query(collection_name: str, query_text: str, k: int = 8, per_domain: int = 3, where: Optional[Dict] = None) -> List[Dict]:
 	client = chromadb.PersistentClient(path=CHROMA_DIR, settings=Settings(anonymized_telemetry=False))
 	collection = _get_or_create_collection(client, collection_name)
 	# Embed query text using OpenAI
-	client_oai = OpenAI(api_key=get_openai_api_key())
+	client_oai = get_shared_openai_client()
 	query_embed = client_oai.embeddings.create(model=OPENAI_EMBED_MODEL, input=[query_text])
 	query_embedding = query_embed.data[0].embedding
 	# Over-fetch to enable diversity filtering
 	overfetch = max(k * 3, k + 10)
-	results = collection.query(query_embeddings=[query_embedding], n_results=overfetch)
+	# A metadata filter is applied inside the index search, not after it
+	results = collection.query(query_embeddings=[query_embedding], n_results=overfetch, where=where)
 	docs = results.get("documents", [[]])[0]
 	metas = results.get("metadatas", [[]])[0]
 	scores = results.get("distances", [[]])[0]
@@ -81,7 +87,7 @@ def query(collection_name: str, query_text: str, k: int = 8, per_domain: int = 3
 	kept: List[Dict] = []
 	per_domain_counts: Dict[str, int] = {}
 	for item in ranked:
-		domain = (item["metadata"] or {}).get("domain") or "unknown"
+		domain = (item["metadata"] or EMPTY_METADATA).get("domain") or "unknown"
 		count = per_domain_counts.get(domain, 0)
 		if count >= per_domain:
 			continue
@@ -94,3 +100,15 @@ def query(collection_name: str, query_text: str, k: int = 8, per_domain: int = 3
 	return kept
 
 
+
+
+def format_context(chunks: List[Dict], with_domain: bool = False) -> str:
+	"""Join retrieved chunks into a prompt context block, each tagged with its source."""
+	blocks = []
+	for c in chunks:
+		meta = c["metadata"] or EMPTY_METADATA
+		source = meta.get("title") or meta.get("source") or "unknown"
+		if with_domain:
+			source = f"{source} | {meta.get('domain') or 'unknown'}"
+		blocks.append(f"[Source: {source}]\n{c['text']}")
+	return "\n\n".join(blocks)
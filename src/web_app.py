@@ -4,9 +4,11 @@ Multi-user web interface for accessing the RAG system and Marketing Council.
 """
 
 import os
+import threading
 import uuid
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, render_template, request, jsonify, session
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from pathlib import Path
 import sys
@@ -15,38 +17,70 @@ import sys
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.agents.researcher import ResearcherAgent
-from src.agents.council import MarketingCouncil
 from src.config import get_openai_api_key
 
+try:
+    import orjson
+except ImportError:  # Fall back to Flask's stdlib json provider
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes straight to bytes with orjson."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=self.default), mimetype=self.mimetype)
+
 # Get absolute paths for templates and static folders
 template_dir = project_root / 'web' / 'templates'
 static_dir = project_root / 'web' / 'static'
 
 app = Flask(__name__, template_folder=str(template_dir), static_folder=str(static_dir))
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'growthboss-ai-companion-secret-key-change-in-production')
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 CORS(app)
 
 # Initialize RAG system
 COLLECTION_NAME = "growthboss-rag"
+_GROWTHBOSS_CONTEXT = "GrowthBoss is a Toronto marketing agency offering website design, brand strategy, SEO, social/performance marketing, photography/videography, and recruitment services. We use the KLT (Know, Like, Trust) Ecosystem framework."
+_COUNCIL_MENTORS = ('Gary Vee', 'Alex Hormozi', 'Iman Gadzhi')
 researcher = None
 council = None
+_INIT_ERROR = None
+_AGENTS_LOCK = threading.Lock()
+_AGENTS_INITIALIZED = False
 
 def init_agents():
     """Initialize RAG and Marketing Council agents."""
-    global researcher, council
+    global researcher, council, _INIT_ERROR
     try:
+        # Imported here so routes that never touch the agents don't pay for
+        # loading openai/chromadb on a cold start
+        from src.agents.researcher import ResearcherAgent
+        from src.agents.council import get_council
+        
         researcher = ResearcherAgent(collection_name=COLLECTION_NAME, use_enhanced=True)
-        council = MarketingCouncil(collection_name=COLLECTION_NAME)
+        council = get_council(COLLECTION_NAME)
+        _INIT_ERROR = None
         return True
     except RuntimeError as e:
         # RuntimeError typically means missing API key
         error_msg = str(e)
+        _INIT_ERROR = error_msg
         print(f"❌ Configuration Error: {error_msg}")
         print("💡 Tip: Create a .env file in the project root with your API keys.")
         return False
     except Exception as e:
         error_type = type(e).__name__
+        _INIT_ERROR = f"{error_type}: {e}"
         print(f"❌ Error initializing agents ({error_type}): {e}")
         print("💡 Check that:")
         print("   - OpenAI API key is set correctly")
@@ -54,8 +88,22 @@ def init_agents():
         print("   - Vector store collection exists")
         return False
 
-# Don't initialize on import - will initialize on first request
-# This prevents errors if RAG system isn't ready yet
+def get_agents():
+    """Return the shared agents, initializing them at most once per process.
+
+    Failures are memoized as well, so health checks on a misconfigured
+    container don't re-run agent construction on every request.
+    """
+    global _AGENTS_INITIALIZED
+    if _AGENTS_INITIALIZED:
+        return researcher, council
+    with _AGENTS_LOCK:
+        if not _AGENTS_INITIALIZED:
+            init_agents()
+            _AGENTS_INITIALIZED = True
+    return researcher, council
+
+# Agents are initialized on first use by /api/chat, not at import
 
 @app.route('/')
 def index():
@@ -66,11 +114,42 @@ def index():
     # Use the new ChatGPT-like interface with purple GrowthBoss branding
     return render_template('index_chatgpt.html')
 
+def _sources(evidence):
+    """Title and domain of the top 5 evidence chunks."""
+    sources = []
+    for ctx in (evidence or [])[:5]:
+        meta = ctx.get('metadata', {})
+        sources.append({
+            'title': meta.get('title') or meta.get('source', 'Unknown'),
+            'domain': meta.get('domain', 'Unknown')
+        })
+    return sources
+
+def _sse_event(payload):
+    return f"data: {app.json.dumps(payload)}\n\n"
+
+def _stream_chat(shared_researcher, shared_council, message, use_council, session_id):
+    """Server-sent events: answer deltas as they arrive, then a closing metadata event."""
+    try:
+        if use_council:
+            deltas = shared_council.stream_synthesis(message, growthboss_context=_GROWTHBOSS_CONTEXT)
+            done = {'sources': [], 'mentors': _COUNCIL_MENTORS}
+        else:
+            evidence, deltas = shared_researcher.research_stream(message, k=12, include_context=True, session_id=session_id)
+            done = {'sources': _sources(evidence), 'context_used': len(evidence)}
+        for delta in deltas:
+            yield _sse_event({'delta': delta})
+    except Exception as e:
+        print(f"Error in chat stream: {e}")
+        yield _sse_event({'error': str(e)})
+        return
+    
+    done.update(done=True, timestamp=datetime.now().isoformat(), session_id=session_id)
+    yield _sse_event(done)
+
 @app.route('/api/chat', methods=['POST'])
 def chat():
     """Handle chat messages."""
-    global researcher, council
-    
     try:
         data = request.json
         message = data.get('message', '').strip()
@@ -80,63 +159,39 @@ def chat():
         if not message:
             return jsonify({'error': 'Message is required'}), 400
         
-        # Initialize agents if not already done
-        if researcher is None:
-            if not init_agents():
-                return jsonify({
-                    'error': 'Failed to initialize AI system',
-                    'message': 'Please check that OPENAI_API_KEY is set in your .env file or environment variables.'
-                }), 500
+        shared_researcher, shared_council = get_agents()
+        if shared_researcher is None:
+            return jsonify({
+                'error': 'Failed to initialize AI system',
+                'message': 'Please check that OPENAI_API_KEY is set in your .env file or environment variables.'
+            }), 500
+        
+        if 'text/event-stream' in request.headers.get('Accept', ''):
+            return Response(
+                _stream_chat(shared_researcher, shared_council, message, use_council, session_id),
+                mimetype='text/event-stream',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
         
         # Use Marketing Council if requested
         if use_council:
-            if council is None:
-                council = MarketingCouncil(collection_name=COLLECTION_NAME)
-            
-            response_text = council.ask(
+            response_text = shared_council.ask(
                 question=message,
-                growthboss_context="GrowthBoss is a Toronto marketing agency offering website design, brand strategy, SEO, social/performance marketing, photography/videography, and recruitment services. We use the KLT (Know, Like, Trust) Ecosystem framework."
+                growthboss_context=_GROWTHBOSS_CONTEXT
             )
             
             return jsonify({
                 'response': response_text,
                 'sources': [],
-                'mentors': ['Gary Vee', 'Alex Hormozi', 'Iman Gadzhi'],
+                'mentors': _COUNCIL_MENTORS,
                 'timestamp': datetime.now().isoformat(),
                 'session_id': session_id
             })
         
-        # Use RAG system with session ID
-        # Initialize researcher if needed
-        if researcher is None:
-            if not init_agents():
-                return jsonify({
-                    'error': 'Failed to initialize RAG system',
-                    'message': 'Please check that OPENAI_API_KEY is set in your .env file or environment variables.'
-                }), 500
-        
-        # Create new researcher instance with session ID if session changed or memory doesn't exist
-        if researcher is not None:
-            needs_new_instance = False
-            if not hasattr(researcher, 'memory'):
-                needs_new_instance = True
-            elif hasattr(researcher.memory, 'session_id') and researcher.memory.session_id != session_id:
-                needs_new_instance = True
-            
-            if needs_new_instance:
-                researcher = ResearcherAgent(collection_name=COLLECTION_NAME, use_enhanced=True, session_id=session_id)
-        
-        result = researcher.research(message, k=12, include_context=True)
+        # Use RAG system with session ID, reusing the warm agent's clients
+        result = shared_researcher.research(message, k=12, include_context=True, session_id=session_id)
         
-        # Extract sources from evidence
-        sources = []
-        if result.get('evidence'):
-            for ctx in result.get('evidence', [])[:5]:  # Top 5 sources
-                meta = ctx.get('metadata', {})
-                sources.append({
-                    'title': meta.get('title') or meta.get('source', 'Unknown'),
-                    'domain': meta.get('domain', 'Unknown')
-                })
+        sources = _sources(result.get('evidence'))
         
         return jsonify({
             'response': result.get('answer', 'I apologize, but I could not generate a response.'),
@@ -154,14 +209,12 @@ def chat():
 def health():
     """Health check endpoint."""
     try:
-        # Check if agents are initialized
-        if researcher is None:
-            init_agents()
-        
+        # Report agent state without forcing initialization
         return jsonify({
             'status': 'healthy',
             'rag_initialized': researcher is not None,
             'council_initialized': council is not None,
+            'error': _INIT_ERROR,
             'timestamp': datetime.now().isoformat()
         })
     except Exception as e:
@@ -170,6 +223,12 @@ def health():
             'error': str(e)
         }), 500
 
+@app.route('/api/warmup', methods=['GET'])
+def warmup():
+    """Initialize agents ahead of the first chat request."""
+    shared_researcher, _ = get_agents()
+    return jsonify({'warm': shared_researcher is not None})
+
 @app.route('/api/session', methods=['GET'])
 def get_session():
     """Get current session ID."""
@@ -182,8 +241,8 @@ if __name__ == '__main__':
     print("GrowthBoss AI Companion - Starting Web Server")
     print("=" * 70)
     
-    # Initialize agents
-    if init_agents():
+    # Initialize agents before serving
+    if get_agents()[0] is not None:
         print("✅ RAG system initialized")
         print("✅ Marketing Council initialized")
     else:
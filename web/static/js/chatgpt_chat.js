@@ -7,6 +7,7 @@ let isTyping = false;
 document.addEventListener('DOMContentLoaded', function() {
     setupEventListeners();
     loadSession();
+    warmUp();
 });
 
 function setupEventListeners() {
@@ -60,6 +61,7 @@ async function sendMessage() {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
+                'Accept': 'text/event-stream, application/json',
             },
             body: JSON.stringify({
                 message: message,
@@ -68,6 +70,13 @@ async function sendMessage() {
             })
         });
 
+        const contentType = response.headers.get('Content-Type') || '';
+        if (contentType.startsWith('text/event-stream')) {
+            await readStream(response, typingId);
+            isTyping = false;
+            return;
+        }
+
         const data = await response.json();
         
         // Remove typing indicator
@@ -109,6 +118,55 @@ function addMessage(role, content) {
     
     // Scroll to bottom
     container.scrollTop = container.scrollHeight;
+    
+    return contentDiv;
+}
+
+async function readStream(response, typingId) {
+    // Render server-sent deltas as they arrive instead of waiting for the full reply
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    const container = document.getElementById('chatContainer');
+    let contentDiv = null;
+    let text = '';
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        for (const event of events) {
+            if (!event.startsWith('data: ')) continue;
+            const data = JSON.parse(event.slice(6));
+
+            if (data.session_id) {
+                sessionId = data.session_id;
+            }
+            if (data.error) {
+                text += text ? '\n\nSorry, I encountered an error.' : 'Sorry, I encountered an error.';
+            } else if (data.delta) {
+                text += data.delta;
+            } else {
+                continue;
+            }
+
+            if (!contentDiv) {
+                removeTypingIndicator(typingId);
+                contentDiv = addMessage('assistant', text);
+            } else {
+                contentDiv.innerHTML = formatMessage(text);
+                container.scrollTop = container.scrollHeight;
+            }
+        }
+    }
+
+    if (!contentDiv) {
+        removeTypingIndicator(typingId);
+        addMessage('assistant', 'Sorry, I encountered an error.');
+    }
 }
 
 function formatMessage(text) {
@@ -152,6 +210,11 @@ function removeTypingIndicator(id) {
     }
 }
 
+function warmUp() {
+    // Fire-and-forget: lets the backend initialize while the user types
+    fetch('/api/warmup').catch(() => {});
+}
+
 function loadSession() {
     fetch('/api/session')
         .then(res => res.json())